@@ -1,7 +1,6 @@
 import re
-import time
-import uuid
 import os
+import hashlib
 from langchain_community.document_loaders import TextLoader, PyMuPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from fastapi import UploadFile
@@ -27,7 +26,7 @@ class FileController(BaseController):
         Returns:
             tuple: A tuple containing a boolean indicating validity and a response signal.
         """
-        if file.content_type not in self.app_settings.FILE_ALLOWED_TYPES:
+        if self.get_file_content_type(file=file) not in self.app_settings.FILE_ALLOWED_TYPES:
             return False, ResponseSignal.FILE_TYPE_NOT_SUPPORTED.value
 
         if file.size > self.app_settings.FILE_MAX_SIZE * self.size_scale:
@@ -35,6 +34,30 @@ class FileController(BaseController):
 
         return True, ResponseSignal.FILE_VALIDATED_SUCCESS
 
+    def get_file_content_type(self, file: UploadFile):
+        """
+        Detects the uploaded file's content type from its leading bytes,
+        instead of trusting the content type declared by the client.
+
+        Args:
+            file (UploadFile): The uploaded file to inspect.
+
+        Returns:
+            str: The detected content type, or None if it couldn't be recognized.
+        """
+        # Peek at the first bytes, then rewind so the file can still be uploaded as a whole
+        file_head = file.file.read(512)
+        file.file.seek(0)
+
+        if file_head.startswith(b"%PDF-"):
+            return "application/pdf"
+
+        # Binary formats almost always contain NUL bytes early on, plain text never does
+        if b"\x00" not in file_head:
+            return "text/plain"
+
+        return None
+
     def get_clean_file_name(self, orig_file_name: str) -> str:
         """
         Cleans the original file name by removing special characters and spaces.
@@ -58,29 +81,48 @@ class FileController(BaseController):
 
         return cleaned_file_name
 
-    def generate_unique_fileid(self, orig_file_name: str) -> str:
+    async def get_file_digest(self, file: UploadFile, part_size: int = 8388608) -> str:
+        """
+        Computes the SHA-256 digest of the uploaded file's content.
+
+        The file is read in parts so large uploads are never held in memory at once,
+        and it is rewound afterwards so it can still be uploaded.
+
+        Args:
+            file (UploadFile): The uploaded file to hash.
+            part_size (int): The number of bytes read per part. Defaults to 8 MB.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the file's content.
+        """
+        file_hash = hashlib.sha256()
+
+        while file_part := await file.read(part_size):
+            file_hash.update(file_part)
+
+        await file.seek(0)
+        return file_hash.hexdigest()
+
+    def generate_unique_fileid(self, orig_file_name: str, file_digest: str) -> str:
         """
-        Generates a unique file path for the uploaded file within the project directory.
+        Generates a content-addressed file ID for the uploaded file.
+
+        Uploading the same content twice yields the same file ID, which lets the
+        duplicated uploads be detected and skipped.
 
         Args:
             orig_file_name (str): The original file name.
-            project_id (str): The ID of the project.
+            file_digest (str): The SHA-256 digest of the file's content.
 
         Returns:
-            tuple: A tuple containing the new file path and the unique file ID.
+            str: The unique file ID, made of the content digest and the original file extension.
         """
 
         # Clean the original file name
         cleaned_file_name = self.get_clean_file_name(orig_file_name=orig_file_name)
 
-        # Generate a UUID (UUIDv4)
-        uuid4 = uuid.uuid4()
-
-        # Add timestamp-based entropy
-        timestamp_entropy = int(time.time() * 1000000)  # Microsecond precision timestamp
-
-        # Create a unique file ID
-        file_id = f"{uuid4}-{timestamp_entropy}-{cleaned_file_name}"
+        # Keep the extension, it is what selects the loader when the file gets processed
+        file_id = f"{file_digest}{self.get_file_extension(file_id=cleaned_file_name)}"
 
         return file_id
 
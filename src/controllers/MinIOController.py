@@ -70,6 +70,22 @@ class MinIOController(BaseController):
             print(f"Error uploading file: {err}")  # Log error during upload
             return False
 
+    def is_file_existed(self, complete_file_id: str) -> bool:
+        """
+        Check whether a file already exists in MinIO.
+
+        Args:
+            complete_file_id (str): Unique identifier (key) for the file in MinIO.
+
+        Returns:
+            bool: True if the file exists, False otherwise.
+        """
+        try:
+            self.minio_client.stat_object(self.bucket_name, complete_file_id)
+            return True
+        except S3Error:
+            return False
+
     def download_file(self, project_id: str, file_id: str):
         """
         Download a file from MinIO to a local path.
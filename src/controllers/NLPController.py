@@ -2,6 +2,7 @@ from typing import List
 import json
 from models import Project, DataChunk
 from stores.llm import DocumentTypeEnum
+from utils.semantic_cache import SemanticCache
 
 
 class NLPController():
@@ -12,7 +13,9 @@ class NLPController():
     handling collections, and performing semantic search and text embedding.
     """
 
-    def __init__(self, vectordb_client, generation_client, embedding_client, template_parser):
+    # pylint: disable=too-many-arguments
+    def __init__(self, vectordb_client, generation_client, embedding_client, template_parser,
+                 semantic_cache: SemanticCache = None):
         """
         Initializes the NLPController instance.
 
@@ -20,12 +23,16 @@ class NLPController():
             vectordb_client (object): Client for interacting with the vector database.
             generation_client (object): Client for text generation (not used in this class).
             embedding_client (object): Client for generating text embeddings.
+            template_parser (TemplateParser): Parser of the prompt templates.
+            semantic_cache (SemanticCache, optional): Cache of the RAG answers, matched by the query
+                                                      embeddings similarity. Defaults to None (no caching).
         """
         super().__init__()
         self.vectordb_client = vectordb_client
         self.generation_client = generation_client
         self.embedding_client = embedding_client
         self.template_parser = template_parser
+        self.semantic_cache = semantic_cache
 
     def create_collection_name(self, project_id: str):
         """
@@ -71,8 +78,8 @@ class NLPController():
             json.dumps(collection_info, default=lambda x: x.__dict__)
         )
 
-    def index_into_vector_db(self, project: Project, chunks: List[DataChunk],
-                              chunks_ids: List[int], do_reset: bool = False):
+    async def index_into_vector_db(self, project: Project, chunks: List[DataChunk],
+                              chunks_ids: List[int], do_reset: bool = False, bulk_mode: bool = False):
         """
         Indexes the data chunks into the vector database.
 
@@ -84,9 +91,12 @@ class NLPController():
             chunks (List[DataChunk]): A list of DataChunk objects containing the text to be indexed.
             chunks_ids (List[int]): A list of chunk IDs to associate with the indexed data.
             do_reset (bool): A flag indicating whether to reset the collection before indexing. Defaults to False.
+            bulk_mode (bool): A flag indicating whether a newly created collection defers its indexing until
+                              it is finalized by `finalize_vector_db_collection`. Defaults to False.
 
         Returns:
-            bool: Returns True if the indexing operation is successful.
+            bool: Returns True if the indexing operation is successful, False if the chunks couldn't be embedded
+                or inserted.
         """
         # Step 1: Get collection name
         collection_name = self.create_collection_name(project_id=project.project_id)
@@ -94,21 +104,22 @@ class NLPController():
         # Step 2: Prepare texts, metadata, and vectors
         texts = [c.chunk_text for c in chunks]
         metadata = [c.chunk_metadata for c in chunks]
-        vectors = [
-            self.embedding_client.embed_text(prompt=text,
-                                             document_type=DocumentTypeEnum.DOCUMENT.value)
-            for text in texts
-        ]
+        vectors = await self.embedding_client.a_embed_texts(prompts=texts,
+                                                            document_type=DocumentTypeEnum.DOCUMENT.value)
+
+        if vectors is None:
+            return False
 
         # Step 3: Create collection if it doesn't exist
         _ = self.vectordb_client.create_collection(
             collection_name=collection_name,
             embedding_size=self.embedding_client.embedding_size,
             do_reset=do_reset,
+            bulk_mode=bulk_mode,
         )
 
         # Step 4: Insert data into the vector database
-        _ = self.vectordb_client.insert_many(
+        return await self.vectordb_client.insert_many_async(
             collection_name=collection_name,
             texts=texts,
             metadata=metadata,
@@ -116,9 +127,20 @@ class NLPController():
             record_ids=chunks_ids,
         )
 
-        return True
+    def finalize_vector_db_collection(self, project: Project):
+        """
+        Enables the indexing of the project's collection once all its chunks are indexed in bulk mode.
+
+        Args:
+            project (Project): The project whose vector database collection is finalized.
+
+        Returns:
+            bool: True if the collection was finalized, False if it doesn't exist.
+        """
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        return self.vectordb_client.finalize_collection(collection_name=collection_name)
 
-    def search_vector_db_collection(self, project: Project, text: str, limit: int = 10):
+    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10):
         """
         Performs a semantic search on the vector database collection for the given project.
 
@@ -136,10 +158,10 @@ class NLPController():
         collection_name = self.create_collection_name(project_id=project.project_id)
 
         # Step 2: Embed the query text into a vector
-        vector = self.embedding_client.embed_text(prompt=text,
-                                                 document_type=DocumentTypeEnum.QUERY.value)
+        vector = await self.embedding_client.a_embed_text(prompt=text,
+                                                          document_type=DocumentTypeEnum.QUERY.value)
 
-        if not vector or len(vector) == 0:
+        if vector is None or len(vector) == 0:
             return False
 
         # Step 3: Perform the semantic search
@@ -154,12 +176,42 @@ class NLPController():
 
         return results
 
-    def answer_rag_question(self, project: Project, query: str, limit: int = 10):
+    async def search_vector_db_collection_batch(self, project: Project, texts: List[str], limit: int = 10):
         """
-        Answers a question using a retrieval-augmented generation (RAG) approach.
+        Performs a semantic search on the vector database collection for each of the given texts.
 
-        This method retrieves relevant documents from the vector database collection and uses
-        a language model to generate an answer based on the retrieved documents.
+        All the texts are embedded together, then searched with a single batch search request
+        instead of a request per text.
+
+        Args:
+            project (Project): The project associated with the vector database collection to search.
+            texts (List[str]): The query texts to be searched.
+            limit (int): The maximum number of results to return per text. Defaults to 10.
+
+        Returns:
+            list or bool: A list of results per text in the same order, or False if the texts couldn't be embedded.
+        """
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        vectors = await self.embedding_client.a_embed_texts(prompts=texts,
+                                                            document_type=DocumentTypeEnum.QUERY.value)
+
+        if not vectors:
+            return False
+
+        return self.vectordb_client.search_batch(
+            collection_name=collection_name,
+            vectors=vectors,
+            limit=limit
+        )
+
+    async def prepare_rag_question(self, project: Project, query: str, limit: int = 10):
+        """
+        Prepares the answer of a question: looks its answer up in the semantic cache, then retrieves
+        its relevant documents and constructs the LLM prompt from them.
+
+        Only the answers are cached, the prompt is always constructed for the current question, so a
+        cached answer is never returned along with the prompt of the question it was generated for.
 
         Args:
             project (Project): The project associated with the vector database collection to search.
@@ -167,18 +219,26 @@ class NLPController():
             limit (int): The maximum number of documents to retrieve. Defaults to 10.
 
         Returns:
-            tuple: A tuple containing the answer, the full prompt used, and the chat history.
+            tuple: The cached answer or None, the query embedding (None if the semantic cache is disabled),
+                then the full prompt and the chat history (both None if no documents were retrieved).
         """
-        answer = full_prompt = chat_history = None
-
-        retrieved_documents = self.search_vector_db_collection(
+        # Step1: look the question up in the semantic cache, the query embedding is cached and
+        # so is reused for free by the search below
+        query_vector, cached_answer = None, None
+        if self.semantic_cache is not None:
+            query_vector = await self.embedding_client.a_embed_text(prompt=query,
+                                                                    document_type=DocumentTypeEnum.QUERY.value)
+            if query_vector is not None:
+                cached_answer = self.semantic_cache.get(project.project_id, query_vector, tag=limit)
+
+        retrieved_documents = await self.search_vector_db_collection(
             project=project,
             text=query,
             limit=limit
         )
 
         if not retrieved_documents or len(retrieved_documents) == 0:
-            return answer, full_prompt, chat_history
+            return None, query_vector, None, None
 
         # Step2: construct LLM prompt
         system_prompt = self.template_parser.get("rag", "system_prompt")
@@ -205,6 +265,80 @@ class NLPController():
 
         full_prompt = "\n\n".join([documents_prompts, footer_prompt])
 
-        answer = self.generation_client.generate_text(prompt=full_prompt, chat_history=chat_history)
+        return cached_answer, query_vector, full_prompt, chat_history
+
+    async def answer_rag_question(self, project: Project, query: str, limit: int = 10):
+        """
+        Answers a question using a retrieval-augmented generation (RAG) approach.
+
+        This method retrieves relevant documents from the vector database collection and uses
+        a language model to generate an answer based on the retrieved documents. When a question
+        similar enough to an already answered one is asked about the same project, the cached
+        answer is returned without generating anything.
+
+        Args:
+            project (Project): The project associated with the vector database collection to search.
+            query (str): The query question to be answered.
+            limit (int): The maximum number of documents to retrieve. Defaults to 10.
+
+        Returns:
+            tuple: A tuple containing the answer, the full prompt used, and the chat history.
+        """
+        cached_answer, query_vector, full_prompt, chat_history = await self.prepare_rag_question(
+            project=project, query=query, limit=limit
+        )
+
+        if full_prompt is None:
+            return None, None, None
+
+        if cached_answer is not None:
+            return cached_answer, full_prompt, chat_history
+
+        answer = await self.generation_client.a_generate_text(prompt=full_prompt, chat_history=chat_history)
+
+        if answer and query_vector is not None:
+            self.semantic_cache.set(project.project_id, query_vector, answer, tag=limit)
 
         return answer, full_prompt, chat_history
+
+    async def stream_rag_answer(self, project: Project, query: str, limit: int = 10):
+        """
+        Answers a question like `answer_rag_question`, streaming the answer as it is generated.
+
+        The documents are retrieved and the prompt is constructed before returning, so a question
+        that can't be answered is reported before any of the answer is sent.
+
+        Args:
+            project (Project): The project associated with the vector database collection to search.
+            query (str): The query question to be answered.
+            limit (int): The maximum number of documents to retrieve. Defaults to 10.
+
+        Returns:
+            tuple: A tuple containing an async generator of the answer text deltas (None if no documents
+                were retrieved), the full prompt used, and the chat history.
+        """
+        cached_answer, query_vector, full_prompt, chat_history = await self.prepare_rag_question(
+            project=project, query=query, limit=limit
+        )
+
+        if full_prompt is None:
+            return None, None, None
+
+        if cached_answer is not None:
+            async def cached_answer_stream():
+                yield cached_answer
+
+            return cached_answer_stream(), full_prompt, chat_history
+
+        async def answer_stream():
+            deltas = []
+            async for delta in self.generation_client.a_stream_text(prompt=full_prompt, chat_history=chat_history):
+                deltas.append(delta)
+                yield delta
+
+            # The whole answer is only known once streamed, it is cached like a generated one
+            answer = "".join(deltas)
+            if answer and query_vector is not None:
+                self.semantic_cache.set(project.project_id, query_vector, answer, tag=limit)
+
+        return answer_stream(), full_prompt, chat_history
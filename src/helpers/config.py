@@ -26,6 +26,9 @@ class Settings(BaseSettings):
     FILE_DEFAULT_CHUNK_SIZE: int
     MONGODB_URL: str
     MONGODB_DATABASE: str
+    MONGODB_MAX_POOL_SIZE: int = 100
+    PROJECT_CACHE_MAX_SIZE: int = 10000
+    PROJECT_CACHE_TTL: int = 600
     MINIO_URL: str
     MINIO_BUCKET_NAME: str
     MINIO_ACCESS_KEY: str
@@ -38,12 +41,22 @@ class Settings(BaseSettings):
     GENERATION_MODEL_ID: Optional[str] = None
     EMBEDDING_MODEL_ID: Optional[str] = None
     EMBEDDING_MODEL_SIZE: Optional[int] = None
+    EMBEDDING_CACHE_SIZE: int = 10000
+    EMBEDDING_CACHE_DIR: Optional[str] = None
+    EMBEDDING_CACHE_TTL: Optional[int] = None
+    SEMANTIC_CACHE_SIZE: int = 1000
+    SEMANTIC_CACHE_THRESHOLD: Optional[float] = None
+    SEMANTIC_CACHE_TTL: int = 600
     INPUT_DAFAULT_MAX_CHARACTERS: Optional[int] = None
     GENERATION_DAFAULT_MAX_TOKENS: Optional[int] = None
     GENERATION_DAFAULT_TEMPERATURE: Optional[float] = None
     VECTOR_DB_BACKEND: str
     VECTOR_DB_URL: str
     VECTOR_DB_DISTANCE_METHOD: Optional[str] = None
+    VECTOR_DB_UPLOAD_CONCURRENCY: int = 4
+    VECTOR_DB_BATCH_SIZE: int = 256
+    VECTOR_DB_GRPC_PORT: Optional[int] = None
+    VECTOR_DB_QUANTIZATION: bool = True
     PRIMARY_LANG: str = "en"
     DEFAULT_LANG: str = "en"
 
@@ -1,10 +1,16 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from motor.motor_asyncio import AsyncIOMotorClient
 from helpers import get_settings
+from models import ResponseSignal
+from services import ProjectModel, ChunkModel, AssetModel
 from routes import base_router, upload_router, process_router, nlp_router
 from stores.llm.LLMProviderFactory import LLMProviderFactory
 from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
 from stores.llm.templates.template_parser import TemplateParser
+from utils.lru_cache import LRUCache
+from utils.semantic_cache import SemanticCache
 
 
 # Creating an instance of the FastAPI class
@@ -17,9 +23,25 @@ async def startup_span():
         This function gets the application connect to DB at startup event.
     """
     settings = get_settings()
-    app.mongo_conn = AsyncIOMotorClient(settings.MONGODB_URL)
+    app.mongo_conn = AsyncIOMotorClient(settings.MONGODB_URL, maxPoolSize=settings.MONGODB_MAX_POOL_SIZE)
     app.db_client = app.mongo_conn[settings.MONGODB_DATABASE]
 
+    # create the collections indexes once, so the requests only construct the models
+    await asyncio.gather(
+        ProjectModel.create_instance(db_client=app.db_client),
+        ChunkModel.create_instance(db_client=app.db_client),
+        AssetModel.create_instance(db_client=app.db_client),
+    )
+
+    # project cache, shared by all the requests of this process
+    app.project_cache = LRUCache(max_size=settings.PROJECT_CACHE_MAX_SIZE, ttl=settings.PROJECT_CACHE_TTL)
+
+    # semantic cache of the RAG answers, disabled when the similarity threshold is unset or 0
+    app.semantic_cache = SemanticCache(max_size=settings.SEMANTIC_CACHE_SIZE,
+                                       threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+                                       ttl=settings.SEMANTIC_CACHE_TTL) \
+        if settings.SEMANTIC_CACHE_THRESHOLD else None
+
     llm_provider_factory = LLMProviderFactory(settings)
     vectordb_provider_factory = VectorDBProviderFactory(settings)
 
@@ -49,7 +71,31 @@ async def shutdown_span():
         This function closes the connection with DB at shutdown event .
     """
     app.mongo_conn.close()
-    app.vectordb_client.disconnect()
+    await app.generation_client.close()
+    # Both clients are the same cached instance when they use the same provider, it is closed once
+    if app.embedding_client is not app.generation_client:
+        await app.embedding_client.close()
+    LLMProviderFactory.clear_cache()
+    await app.vectordb_client.disconnect()
+
+# A FastAPI middleware to reject oversized uploads before their body is read
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """
+        This function rejects uploads whose Content-Length header exceeds the maximum file size,
+        so the client's bytes are never streamed in and parsed just to be discarded.
+    """
+    content_length = request.headers.get("content-length")
+
+    if request.url.path.startswith(f"{upload_router.prefix}/upload/") and content_length and content_length.isdigit():
+        settings = get_settings()
+        if int(content_length) > settings.FILE_MAX_SIZE * 1048576:
+            return JSONResponse(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                content={"signal": ResponseSignal.FILE_SIZE_EXCEEDED.value}
+            )
+
+    return await call_next(request)
 
 # A FastAPI event to connect to DB on app startup
 # app.router.lifespan.on_startup.append(startup_db_client)
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from bson.objectid import ObjectId
 from pymongo import ASCENDING
 
@@ -14,14 +14,8 @@ class Asset(BaseModel):
     asset_config: dict = Field(default=None)
     asset_created_at: datetime = Field(default=datetime.utcnow)
 
-    class Config:
-        """
-        Configuration for the Pydantic model.
-
-        Attributes:
-            arbitrary_types_allowed (bool): Enables the use of non-standard types like ObjectId.
-        """
-        arbitrary_types_allowed = True
+    # Enables the use of non-standard types like ObjectId
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
     @classmethod
     def get_indexes(cls):
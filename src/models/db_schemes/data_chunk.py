@@ -1,6 +1,8 @@
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+import bson
 from bson.objectid import ObjectId
+from bson.raw_bson import RawBSONDocument
 from pymongo import ASCENDING
 
 
@@ -23,14 +25,42 @@ class DataChunk(BaseModel):
     chunk_project_id: ObjectId
     chunk_asset_id: ObjectId
 
-    class Config:
+    # Enables the use of non-standard types like ObjectId
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @classmethod
+    def from_raw(cls, raw: RawBSONDocument):
         """
-        Configuration for the Pydantic model.
+        Builds a chunk from an undecoded BSON document.
+
+        The document is decoded in a single pass, rather than field by field,
+        only when the full chunk is actually needed.
 
-        Attributes:
-            arbitrary_types_allowed (bool): Enables the use of non-standard types like ObjectId.
+        Args:
+            raw (RawBSONDocument): The chunk document as returned by a raw BSON cursor.
+
+        Returns:
+            DataChunk: The decoded chunk.
+        """
+        return cls(**bson.decode(raw.raw))
+
+    def to_raw(self):
+        """
+        Encodes the chunk into a BSON document ready to be inserted.
+
+        The already validated field values are encoded straight from the instance, under
+        their aliases and leaving out the unset fields like `model_dump(by_alias=True,
+        exclude_unset=True)` would, without going through pydantic's serializer first.
+
+        Returns:
+            RawBSONDocument: The encoded chunk.
         """
-        arbitrary_types_allowed = True
+        fields = type(self).model_fields
+        return RawBSONDocument(bson.encode({
+            fields[name].alias or name: value
+            for name, value in self.__dict__.items()
+            if name in self.model_fields_set
+        }))
 
     @classmethod
     def get_indexes(cls):
@@ -41,9 +71,12 @@ class DataChunk(BaseModel):
         Indexes are important for optimizing query performance, especially
         for fields that are frequently queried or sorted.
 
-        In this case, we define an index on the "chunk_project_id" field,
-        which is not unique, meaning multiple documents can have the same
-        "chunk_project_id".
+        In this case, we define a compound index on the "chunk_project_id" and "_id"
+        fields, which is not unique, meaning multiple documents can have the same
+        "chunk_project_id". Following the Equality, Sort, Range rule, the equality
+        field comes first and "_id" second, as it serves as both the sort and the
+        range key of the paginated chunks queries. Being a prefix of it, a separate
+        index on "chunk_project_id" alone would be redundant.
 
         Returns:
             list: A list of index definitions, each represented by a dictionary.
@@ -55,9 +88,10 @@ class DataChunk(BaseModel):
         return [
             {
                 "key": [
-                    ("chunk_project_id", ASCENDING)  # Indexes "chunk_project_id" field in ascending order
+                    ("chunk_project_id", ASCENDING),  # Equality match on the project
+                    ("_id", ASCENDING)  # Sort and range key of the paginated chunks queries
                 ],
-                "name": "chunk_project_id_index_1",  # The name of the index
+                "name": "chunk_project_id_id_index_1",  # The name of the index
                 "unique": False  # This index does not enforce uniqueness
             }
         ]
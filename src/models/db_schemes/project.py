@@ -1,5 +1,5 @@
 from typing import Optional
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from bson.objectid import ObjectId
 from pymongo import ASCENDING
 
@@ -34,14 +34,8 @@ class Project(BaseModel):
             raise ValueError('project_id must be alphanumeric')
         return value
 
-    class Config:
-        """
-        Configuration for the Pydantic model.
-
-        Attributes:
-            arbitrary_types_allowed (bool): Enables the use of non-standard types like ObjectId.
-        """
-        arbitrary_types_allowed = True
+    # Enables the use of non-standard types like ObjectId
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
     @classmethod
     def get_indexes(cls):
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, status, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from utils.logger import logger
 from routes.schemes.nlp import PushRequest, SearchRequest
 from services import ProjectModel, ChunkModel
@@ -21,9 +21,9 @@ async def index_project(request: Request, project_id: str, push_request: PushReq
     Returns:
         JSONResponse: A JSON response with the status of the operation and the number of inserted items.
     """
-    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
-    chunk_model = await ChunkModel.create_instance(db_client=request.app.db_client)
-    project = await project_model.get_project_or_create_one(project_id=project_id)
+    project_model = ProjectModel(db_client=request.app.db_client, project_cache=request.app.project_cache)
+    chunk_model = ChunkModel(db_client=request.app.db_client)
+    project = await project_model.get_cached_project(project_id=project_id)
 
     if not project:
         logger.error("Project not found.")
@@ -37,43 +37,60 @@ async def index_project(request: Request, project_id: str, push_request: PushReq
     nlp_controller = NLPController(vectordb_client=request.app.vectordb_client,
                                    generation_client=request.app.generation_client,
                                    embedding_client=request.app.embedding_client,
-                                   template_parser=request.app.template_parser
+                                   template_parser=request.app.template_parser,
+                                   semantic_cache=request.app.semantic_cache
     )
 
-    has_records = True
-    page_no = 1
+    # Every flushed batch is embedded with a single request to the embedding provider
+    embed_batch_size = request.app.embedding_client.embedding_batch_size
     inserted_items_count = 0
-    idx = 0
 
-    while has_records:
-        page_chunks = await chunk_model.get_poject_chunks(project_id=project.id, page_no=page_no)
-        if len(page_chunks):
-            page_no += 1
+    async def flush_batch(batch: list):
+        # The collection is only reset before the first batch, so later batches don't wipe earlier ones.
+        # It is created in bulk mode, its indexing is deferred until all the batches are inserted
+        return await nlp_controller.index_into_vector_db(
+            project=project,
+            chunks=batch,
+            do_reset=push_request.do_reset if inserted_items_count == 0 else 0,
+            chunks_ids=list(range(inserted_items_count, inserted_items_count + len(batch))),
+            bulk_mode=True
+        )
+
+    is_inserted = True
+    batch = []
+
+    async for chunk in chunk_model.iter_project_chunks(project_id=project.id):
+        batch.append(chunk)
+        if len(batch) < embed_batch_size:
+            continue
 
-        if not page_chunks or len(page_chunks) == 0:
-            has_records = False
+        is_inserted = await flush_batch(batch)
+        if not is_inserted:
             break
 
-        chunks_ids =  list(range(idx, idx + len(page_chunks)))
-        idx += len(page_chunks)
+        inserted_items_count += len(batch)
+        batch = []
 
-        is_inserted = nlp_controller.index_into_vector_db(
-            project=project,
-            chunks=page_chunks,
-            do_reset=push_request.do_reset,
-            chunks_ids=chunks_ids
-        )
+    if is_inserted and batch:
+        is_inserted = await flush_batch(batch)
+        if is_inserted:
+            inserted_items_count += len(batch)
 
-        if not is_inserted:
-            logger.error("Inserting into vector DB.")
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={
-                    "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
-                }
-            )
+    # Build the index of the collection once, over all the inserted chunks
+    _ = nlp_controller.finalize_vector_db_collection(project=project)
+
+    # The cached answers were built from the previous content of the index
+    if request.app.semantic_cache is not None:
+        request.app.semantic_cache.invalidate(project.project_id)
 
-        inserted_items_count += len(page_chunks)
+    if not is_inserted:
+        logger.error("Inserting into vector DB.")
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
+            }
+        )
 
     return JSONResponse(
         content={
@@ -94,11 +111,12 @@ async def get_project_index_info(request: Request, project_id: str):
     Returns:
         JSONResponse: A JSON response with the project index information.
     """
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client
+    project_model = ProjectModel(
+        db_client=request.app.db_client,
+        project_cache=request.app.project_cache
     )
 
-    project = await project_model.get_project_or_create_one(
+    project = await project_model.get_cached_project(
         project_id=project_id
     )
 
@@ -106,7 +124,8 @@ async def get_project_index_info(request: Request, project_id: str):
         vectordb_client=request.app.vectordb_client,
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser
+        template_parser=request.app.template_parser,
+        semantic_cache=request.app.semantic_cache
     )
 
     collection_info = nlp_controller.get_vector_db_collection_info(project=project)
@@ -131,11 +150,12 @@ async def search_index(request: Request, project_id: str, search_request: Search
     Returns:
         JSONResponse: A JSON response with the search results or error signal.
     """
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client
+    project_model = ProjectModel(
+        db_client=request.app.db_client,
+        project_cache=request.app.project_cache
     )
 
-    project = await project_model.get_project_or_create_one(
+    project = await project_model.get_cached_project(
         project_id=project_id
     )
 
@@ -143,10 +163,11 @@ async def search_index(request: Request, project_id: str, search_request: Search
         vectordb_client=request.app.vectordb_client,
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser
+        template_parser=request.app.template_parser,
+        semantic_cache=request.app.semantic_cache
     )
 
-    results = nlp_controller.search_vector_db_collection(
+    results = await nlp_controller.search_vector_db_collection(
         project=project, text=search_request.text, limit=search_request.limit
     )
 
@@ -162,7 +183,7 @@ async def search_index(request: Request, project_id: str, search_request: Search
     return JSONResponse(
         content={
             "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
-            "results": [ result.dict()  for result in results ]
+            "results": [result.model_dump() for result in results]
         }
     )
 
@@ -179,11 +200,12 @@ async def answer_rag(request: Request, project_id: str, search_request: SearchRe
     Returns:
         JSONResponse: A JSON response with the search results or error signal.
     """
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.db_client
+    project_model = ProjectModel(
+        db_client=request.app.db_client,
+        project_cache=request.app.project_cache
     )
 
-    project = await project_model.get_project_or_create_one(
+    project = await project_model.get_cached_project(
         project_id=project_id
     )
 
@@ -191,10 +213,11 @@ async def answer_rag(request: Request, project_id: str, search_request: SearchRe
         vectordb_client=request.app.vectordb_client,
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser
+        template_parser=request.app.template_parser,
+        semantic_cache=request.app.semantic_cache
     )
 
-    answer, full_prompt, chat_history = nlp_controller.answer_rag_question(
+    answer, full_prompt, chat_history = await nlp_controller.answer_rag_question(
         project=project,
         query=search_request.text,
         limit=search_request.limit)
@@ -216,3 +239,49 @@ async def answer_rag(request: Request, project_id: str, search_request: SearchRe
                 "chat_history": chat_history
             }
     )
+
+@nlp_router.post("/index/answer/stream/{project_id}")
+async def stream_answer_rag(request: Request, project_id: str, search_request: SearchRequest):
+    """
+    Endpoint to answer a question about a given project, streaming the answer as it is generated.
+
+    Args:
+        request (Request): The FastAPI request object.
+        project_id (str): The ID of the project to search in.
+        search_request (SearchRequest): The request body containing the search query and limit.
+
+    Returns:
+        StreamingResponse | JSONResponse: The plain text answer stream, or a JSON response with the error signal.
+    """
+    project_model = ProjectModel(
+        db_client=request.app.db_client,
+        project_cache=request.app.project_cache
+    )
+
+    project = await project_model.get_cached_project(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        semantic_cache=request.app.semantic_cache
+    )
+
+    answer_stream, _, _ = await nlp_controller.stream_rag_answer(
+        project=project,
+        query=search_request.text,
+        limit=search_request.limit)
+
+    if answer_stream is None:
+        logger.error("RAG answer.")
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.RAG_ANSWER_ERROR.value
+            }
+        )
+
+    return StreamingResponse(answer_stream, media_type="text/plain")
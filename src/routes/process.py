@@ -29,11 +29,11 @@ async def process_endpoint(request: Request,
     do_reset = process_request.do_reset
 
     # Retrieve the project model to fetch the project data from the database
-    project_model = ProjectModel(db_client=request.app.db_client)
-    project = await project_model.get_project_or_create_one(project_id=project_id)
+    project_model = ProjectModel(db_client=request.app.db_client, project_cache=request.app.project_cache)
+    project = await project_model.get_cached_project(project_id=project_id)
 
     # Initialize the ChunkModel to handle chunk data in the database
-    chunk_model = await ChunkModel.create_instance(db_client=request.app.db_client)
+    chunk_model = ChunkModel(db_client=request.app.db_client)
 
     if do_reset == 1:
         # If the reset flag is set, delete existing chunks associated with the project
@@ -45,6 +45,18 @@ async def process_endpoint(request: Request,
             }
         )
 
+    # Look the asset up before downloading and splitting the file, so an invalid file ID fails fast
+    asset_model = AssetModel(db_client=request.app.db_client)
+    asset_record = await asset_model.get_asset_record(asset_project_id=project.id, asset_name=file_id)
+
+    if asset_record is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.FILE_ID_ERROR.value
+            }
+        )
+
     # Initialize the FileController to handle file processing
     file_controller = FileController(project_id)
 
@@ -72,18 +84,6 @@ async def process_endpoint(request: Request,
             content={"signal": ResponseSignal.PROCESSING_FAILD.value}
         )
 
-    asset_model = await AssetModel.create_instance(db_client=request.app.db_client)
-    asset_record = await asset_model.get_asset_record(asset_project_id=project.id, asset_name=file_id)
-
-    if asset_record is None:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={
-                "signal": ResponseSignal.FILE_ID_ERROR.value
-            }
-        )
-
-
     # Prepare the processed file chunks to be saved into the database
     file_chunks_records = [
         DataChunk(
@@ -96,8 +96,9 @@ async def process_endpoint(request: Request,
         for i, chunk in enumerate(file_chunks)
     ]
 
-    # Insert the newly processed chunks into the database
-    inserted_chunks = await chunk_model.insert_many_chunks(chunks=file_chunks_records)
+    # Insert the newly processed chunks into the database, waiting for the writes to be acknowledged
+    # so the reported count is accurate and the chunks are visible to a following push
+    inserted_chunks = await chunk_model.insert_many_chunks(chunks=file_chunks_records, fast_insert=False)
     return JSONResponse(
         content={
             "signal": ResponseSignal.PROCESSING_SUCCESS.value,
@@ -123,32 +124,15 @@ async def processall_endpoint(request: Request,
     do_reset = process_request.do_reset
 
     # Retrieve the project model to fetch the project data from the database
-    project_model = ProjectModel(db_client=request.app.db_client)
-    project = await project_model.get_project_or_create_one(project_id=project_id)
-
-    asset_model = await AssetModel.create_instance(db_client=request.app.db_client)
-    assets_records = await asset_model.get_all_project_assets(
-        asset_project_id=project.id,
-        asset_type=AssetTypeEnum.FILE.value)
-
-    file_ids = {
-        record.id: record.asset_name
-        for record in assets_records
-    }
-
-    if len(file_ids) == 0:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={
-                "signal": ResponseSignal.NO_FILES_ERROR.value
-            }
-        )
+    project_model = ProjectModel(db_client=request.app.db_client, project_cache=request.app.project_cache)
+    project = await project_model.get_cached_project(project_id=project_id)
 
     # Initialize the ChunkModel to handle chunk data in the database
-    chunk_model = await ChunkModel.create_instance(db_client=request.app.db_client)
+    chunk_model = ChunkModel(db_client=request.app.db_client)
 
     if do_reset == 1:
-        # If the reset flag is set, delete existing chunks associated with the project
+        # If the reset flag is set, delete existing chunks associated with the project,
+        # the project assets are never needed in this case so they are not looked up
         deleted_chunks = await chunk_model.delete_chunks_by_project_id(project_id=project.id)
         return JSONResponse(
                 content={
@@ -157,11 +141,21 @@ async def processall_endpoint(request: Request,
                 }
             )
 
+    asset_model = AssetModel(db_client=request.app.db_client)
+
+    # The assets are streamed lazily, so no query is issued until the loop below starts
+    assets_records = asset_model.iter_project_assets(
+        asset_project_id=project.id,
+        asset_type=AssetTypeEnum.FILE.value)
+
     # Initialize the FileController to handle file processing
     file_controller = FileController(project_id)
-    deleted_chunks = inserted_chunks = processed_files = 0
+    found_files = inserted_chunks = processed_files = 0
+
+    async for record in assets_records:
+        asset_id, file_id = record.id, record.asset_name
+        found_files += 1
 
-    for asset_id, file_id in file_ids.items():
         # Fetch the file content using the file controller
         file_content = file_controller.get_file_content(project_id=project_id, file_id=file_id)
 
@@ -195,10 +189,18 @@ async def processall_endpoint(request: Request,
             for i, chunk in enumerate(file_chunks)
         ]
 
-        # Insert the newly processed chunks into the database
-        inserted_chunks += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
+        # Insert the newly processed chunks into the database, waiting for the writes to be acknowledged
+        inserted_chunks += await chunk_model.insert_many_chunks(chunks=file_chunks_records, fast_insert=False)
         processed_files += 1
 
+    if found_files == 0:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.NO_FILES_ERROR.value
+            }
+        )
+
     return JSONResponse(
         content={
             "signal": ResponseSignal.PROCESSING_SUCCESS.value,
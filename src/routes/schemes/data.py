@@ -1,5 +1,5 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 class ProcessRequest(BaseModel):
     """
@@ -11,6 +11,7 @@ class ProcessRequest(BaseModel):
         overlap_size (Optional[int]): The size of overlap between chunks, default to 20
         do_reset (Optional[int]): Flag to indicate whether to reset the process, default to false
     """
+    model_config = ConfigDict(extra="ignore", frozen=True)
 
     file_id: Optional[str] = None
     chunk_size: Optional[int] = 100
@@ -1,5 +1,5 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 class PushRequest(BaseModel):
     """
@@ -9,6 +9,8 @@ class PushRequest(BaseModel):
         do_reset (Optional[int]): Flag indicating whether to reset the collection before pushing the data.
                                    Defaults to 0 (no reset).
     """
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     do_reset: Optional[int] = 0
 
 class SearchRequest(BaseModel):
@@ -19,5 +21,7 @@ class SearchRequest(BaseModel):
         text (str): The query text to search for in the vector database.
         limit (Optional[int]): The maximum number of search results to return. Defaults to 5.
     """
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     text: str
     limit: Optional[int] = 5
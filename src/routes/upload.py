@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, UploadFile, status, Request
 from fastapi.responses import JSONResponse
+from pymongo.errors import DuplicateKeyError
 from helpers import get_settings, Settings
 from models import ResponseSignal, Asset, AssetTypeEnum
 from services import ProjectModel, AssetModel
@@ -26,10 +27,10 @@ async def upload_data(
     Returns an error if the file is invalid.
     """
     # Retrieve the project model to interact with project data from the database
-    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+    project_model = ProjectModel(db_client=request.app.db_client, project_cache=request.app.project_cache)
 
     # Retrieves an existing project by its ID or creates a new one if it doesn't exist.
-    project = await project_model.get_project_or_create_one(project_id=project_id)
+    project = await project_model.get_cached_project(project_id=project_id)
 
     # Create a FileController instance for the given project_id to manage file-related operations
     file_controller = FileController(project_id)
@@ -44,38 +45,51 @@ async def upload_data(
             content={"signal": signal}
         )
 
-    # Generate a unique file ID for the uploaded file
-    file_id = file_controller.generate_unique_fileid(orig_file_name=file.filename)
+    # Generate a content-addressed file ID for the uploaded file
+    file_digest = await file_controller.get_file_digest(file=file)
+    file_id = file_controller.generate_unique_fileid(orig_file_name=file.filename, file_digest=file_digest)
 
     complete_file_id = f"{project_id}/{file_id}"
 
-    # Create a MinIOController instance to manage file uploads to MinIO storage
-    minio_controller = MinIOController()
-    is_uploaded = await minio_controller.upload_file(complete_file_id, file)
+    asset_model = AssetModel(db_client=request.app.db_client)
+    asset_record = await asset_model.get_asset_record(asset_project_id=project.id, asset_name=file_id)
 
-    if is_uploaded:
-        # If the file upload is successful, store assets into the database,
-        # and return a successful response with the file ID and project ID
+    if asset_record is None:
+        # Create a MinIOController instance to manage file uploads to MinIO storage,
+        # the object may already be there if a previous upload failed before storing its asset
+        minio_controller = MinIOController()
+        is_uploaded = minio_controller.is_file_existed(complete_file_id) or \
+            await minio_controller.upload_file(complete_file_id, file)
+
+        if not is_uploaded:
+            # If the file upload fails, return a Bad Request response with the failure signal
+            return JSONResponse(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    content={"signal": ResponseSignal.FILE_UPLOADED_FAILED.value},
+            )
+
+        # If the file upload is successful, store assets into the database
         logger.info("File: %s has been uploaded successfully.", file_id)
 
-        asset_model = await AssetModel.create_instance(db_client=request.app.db_client)
         asset = Asset(asset_project_id=project.id,
                       asset_type=AssetTypeEnum.FILE.value,
                       asset_name=file_id,
                       asset_size=file.size)
-        asset_record = await asset_model.create_asset(asset=asset)
-
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={
-                "signal": ResponseSignal.FILE_UPLOADED_SUCCESS.value,
-                "file_id": asset_record.asset_name,
-                "project_id": str(project.id)
-            },
-        )
+        try:
+            asset_record = await asset_model.create_asset(asset=asset)
+        except DuplicateKeyError:
+            # A concurrent upload of the same content stored the asset first
+            asset_record = await asset_model.get_asset_record(asset_project_id=project.id, asset_name=file_id)
+    else:
+        # The same content was already uploaded to this project, so the whole pipeline is skipped
+        logger.info("File: %s has already been uploaded.", file_id)
 
-    # If the file upload fails, return a Bad Request response with the failure signal
+    # Return a successful response with the file ID and project ID
     return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"signal": ResponseSignal.FILE_UPLOADED_FAILED.value},
+        status_code=status.HTTP_200_OK,
+        content={
+            "signal": ResponseSignal.FILE_UPLOADED_SUCCESS.value,
+            "file_id": asset_record.asset_name,
+            "project_id": str(project.id)
+        },
     )
@@ -1,32 +1,41 @@
+import sys
+import asyncio
 from bson.objectid import ObjectId
+from pymongo import ASCENDING
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from models import DataBaseEnum, Asset
 from .BaseDataModel import BaseDataModel
 
 
+# The collection name, resolved once at import instead of on every model construction
+_ASSET_COLL = sys.intern(DataBaseEnum.COLLECTION_ASSET_NAME.value)
+
+
 class AssetModel(BaseDataModel):
     """
     Model class for managing asset records in the database.
 
     Inherits from BaseDataModel to leverage common database functionalities.
     """
+    __slots__ = ("collection",)
 
-    def __init__(self, db_client: object):
+    def __init__(self, db_client: AsyncIOMotorDatabase):
         """
         Initializes the AssetModel instance.
 
         Args:
-            db_client (object): The database client instance used to interact with the database.
+            db_client (AsyncIOMotorDatabase): The database client instance used to interact with the database.
         """
         super().__init__(db_client=db_client)
-        self.collection = self.db_client[DataBaseEnum.COLLECTION_ASSET_NAME.value]
+        self.collection = self.db_client[_ASSET_COLL]
 
     @classmethod
-    async def create_instance(cls, db_client: object):
+    async def create_instance(cls, db_client: AsyncIOMotorDatabase):
         """
         Asynchronously creates an instance of the AssetModel.
 
         Args:
-            db_client (object): The database client instance.
+            db_client (AsyncIOMotorDatabase): The database client instance.
 
         Returns:
             AssetModel: An initialized instance of AssetModel.
@@ -37,20 +46,19 @@ class AssetModel(BaseDataModel):
 
     async def init_collection(self):
         """
-        Ensures the collection for assets exists in the database.
+        Ensures the collection for assets exists in the database with the necessary indexes.
 
-        If the collection does not exist, it is created and the necessary indexes are applied.
+        Creating an index that already exists is a no-op, so it is run unconditionally, once at startup.
         """
-        all_collections = await self.db_client.list_collection_names()
-        if DataBaseEnum.COLLECTION_ASSET_NAME.value not in all_collections:
-            self.collection = self.db_client[DataBaseEnum.COLLECTION_ASSET_NAME.value]
-            indexes = Asset.get_indexes()
-            for index in indexes:
-                await self.collection.create_index(
-                    index["key"],
-                    name=index["name"],
-                    unique=index["unique"]
-                )
+        indexes = Asset.get_indexes()
+        await asyncio.gather(*[
+            self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index["unique"]
+            )
+            for index in indexes
+        ])
 
     async def create_asset(self, asset: Asset):
         """
@@ -62,7 +70,7 @@ class AssetModel(BaseDataModel):
         Returns:
             Asset: The inserted asset object, with the `id` field populated.
         """
-        result = await self.collection.insert_one(asset.dict(by_alias=True, exclude_unset=True))
+        result = await self.collection.insert_one(asset.model_dump(by_alias=True, exclude_unset=True))
         asset.id = result.inserted_id
         return asset
 
@@ -77,15 +85,44 @@ class AssetModel(BaseDataModel):
         Returns:
             list[Asset]: A list of Asset objects matching the criteria.
         """
-        records = await self.collection.find({
+        return [
+            asset
+            async for asset in self.iter_project_assets(asset_project_id=asset_project_id, asset_type=asset_type)
+        ]
+
+    async def iter_project_assets(self, asset_project_id: str, asset_type: str, batch_size: int = 100):
+        """
+        Iterates over all assets for a specific project and asset type.
+
+        The assets are fetched in pages ordered by `_id`, each page resuming right after the last
+        asset of the previous one. No cursor is held open while the caller works on an asset, so a
+        slow caller (e.g., one downloading and processing every file) never hits the server's idle
+        cursor timeout, and stopping the iteration early leaves nothing to close.
+
+        Args:
+            asset_project_id (str): The ID of the project associated with the assets.
+            asset_type (str): The type of assets to retrieve.
+            batch_size (int): The number of assets fetched per page. Defaults to 100.
+
+        Yields:
+            Asset: The Asset objects matching the criteria.
+        """
+        query = {
             "asset_project_id": ObjectId(asset_project_id) if isinstance(asset_project_id, str) else asset_project_id,
             "asset_type": asset_type,
-        }).to_list(length=None)
+        }
 
-        return [
-            Asset(**record)
-            for record in records
-        ]
+        while True:
+            records = await self.collection.find(query).sort("_id", ASCENDING).limit(batch_size) \
+                .to_list(length=batch_size)
+
+            for record in records:
+                yield Asset(**record)
+
+            if len(records) < batch_size:
+                return
+
+            query["_id"] = {"$gt": records[-1]["_id"]}
 
     async def get_asset_record(self, asset_project_id: str, asset_name: str):
         """
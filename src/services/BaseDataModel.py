@@ -1,12 +1,15 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from helpers import get_settings
 
 class BaseDataModel:
-    def __init__(self, db_client: object):
+    __slots__ = ("db_client", "app_settings")
+
+    def __init__(self, db_client: AsyncIOMotorDatabase):
         """
         Initializes the BaseDataModel instance with a database client and application settings.
 
         Args:
-            db_client (object): The connection object used to interact with the database.
+            db_client (AsyncIOMotorDatabase): The connection object used to interact with the database.
         """
 
         # Assign the provided db_client to an instance attribute for database interaction.
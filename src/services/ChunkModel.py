@@ -1,28 +1,43 @@
+import sys
+import asyncio
+from typing import List, Union
+from bson.codec_options import CodecOptions
 from bson.objectid import ObjectId
-from pymongo import InsertOne
+from bson.raw_bson import RawBSONDocument
+from pymongo import ASCENDING
+from pymongo.write_concern import WriteConcern
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from models import DataChunk, DataBaseEnum
 from .BaseDataModel import BaseDataModel
 
 
+# The collection name, resolved once at import instead of on every model construction
+_CHUNK_COLL = sys.intern(DataBaseEnum.COLLECTION_CHUNK_NAME.value)
+
+# Returns the documents as undecoded BSON, each field is only decoded when it is accessed
+_RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+
 class ChunkModel(BaseDataModel):
     """
     Model class for managing data chunks in the database.
 
     Inherits from BaseDataModel to utilize common database functionalities.
     """
+    __slots__ = ("collection",)
 
-    def __init__(self, db_client: object):
+    def __init__(self, db_client: AsyncIOMotorDatabase):
         """
         Initializes the ChunkModel instance.
 
         Args:
-            db_client (object): The database client instance to interact with the database.
+            db_client (AsyncIOMotorDatabase): The database client instance to interact with the database.
         """
         super().__init__(db_client=db_client)
-        self.collection = self.db_client[DataBaseEnum.COLLECTION_CHUNK_NAME.value]
+        self.collection = self.db_client[_CHUNK_COLL]
 
     @classmethod
-    async def create_instance(cls, db_client: object):
+    async def create_instance(cls, db_client: AsyncIOMotorDatabase):
         """
         Class method to create an instance of the class and initialize the collection.
 
@@ -31,7 +46,7 @@ class ChunkModel(BaseDataModel):
             2. Initialize the collection associated with the instance by calling the `init_collection` method.
 
         Args:
-            db_client (object): The database client to interact with the database.
+            db_client (AsyncIOMotorDatabase): The database client to interact with the database.
 
         Returns:
             object: The newly created instance of the class with the initialized collection.
@@ -47,36 +62,30 @@ class ChunkModel(BaseDataModel):
 
     async def init_collection(self):
         """
-        Initializes the chunk collection in the database by ensuring it exists.
-        If the collection does not exist, it will be created, and the appropriate indexes
-        will be added based on the DataChunk model's index definitions.
+        Initializes the chunk collection in the database by creating its indexes.
+        The collection is created along with its first index if it does not exist yet.
 
         This method performs the following actions:
-            1. Checks if the chunk collection exists in the database.
-            2. If the collection does not exist, it is created.
-            3. Retrieves the index definitions from the DataChunk model.
-            4. Creates each index in the chunk collection, ensuring proper indexing
+            1. Retrieves the index definitions from the DataChunk model.
+            2. Creates each index in the chunk collection, ensuring proper indexing
                for the fields and enforcing uniqueness where specified.
-        """
-        # Retrieve a list of all collection names in the database
-        all_collections = await self.db_client.list_collection_names()
-
-        # Check if the specific collection (PROJECT_COLLECTION_NAME) does not exist
-        if DataBaseEnum.COLLECTION_CHUNK_NAME.value not in all_collections:
-            # If the collection does not exist, create it by referencing the collection name
-            self.collection = self.db_client[DataBaseEnum.COLLECTION_CHUNK_NAME.value]
 
-            # Retrieve the indexes for the DataChunk model
-            indexes = DataChunk.get_indexes()
-
-            # Iterate over the list of indexes and create each index on the collection
-            # pylint: disable=R0801
-            for index in indexes:
-                await self.collection.create_index(
-                    index["key"],        # The fields for the index (e.g., field_name: 1 for ascending)
-                    name=index["name"],  # The name of the index (e.g., "index_name")
-                    unique=index["unique"]  # Whether the index should enforce uniqueness
-                )
+        Creating an index that already exists is a no-op on the server, so there is no need
+        to list the collections first. It is run once at the application startup.
+        """
+        # Retrieve the indexes for the DataChunk model
+        indexes = DataChunk.get_indexes()
+
+        # Create all the indexes on the collection concurrently, overlapping their round-trips
+        # pylint: disable=R0801
+        await asyncio.gather(*[
+            self.collection.create_index(
+                index["key"],        # The fields for the index (e.g., field_name: 1 for ascending)
+                name=index["name"],  # The name of the index (e.g., "index_name")
+                unique=index["unique"]  # Whether the index should enforce uniqueness
+            )
+            for index in indexes
+        ])
 
     async def create_chunk(self, chunk: DataChunk):
         """
@@ -90,51 +99,109 @@ class ChunkModel(BaseDataModel):
         Returns:
             DataChunk: The chunk with its updated ID.
         """
-        result = await self.collection.insert_one(chunk.dict(by_alias=True, exclude_unset=True))
+        result = await self.collection.insert_one(chunk.model_dump(by_alias=True, exclude_unset=True))
         chunk.id = result.inserted_id
         return chunk
 
-    async def get_chunck(self, chunk_id: str):
+    async def get_chunck(self, chunk_id: Union[str, ObjectId]):
         """
         Retrieves a chunk from the database using its ID.
 
         Searches for a chunk in the collection by its ObjectId.
 
         Args:
-            chunk_id (str): The ID of the chunk to retrieve.
+            chunk_id (Union[str, ObjectId]): The ID of the chunk to retrieve. An ObjectId is used
+                                             as it is, a string is parsed into one.
 
         Returns:
             DataChunk or None: The retrieved chunk, or None if no match is found.
         """
         result = await self.collection.find_one({
-            "_id": ObjectId(chunk_id)
+            "_id": chunk_id if isinstance(chunk_id, ObjectId) else ObjectId(chunk_id)
         })
 
         if result is None:
             return None
         return DataChunk(**result)
 
-    async def insert_many_chunks(self, chunks: list, batch_size: int = 2):
+    async def get_chunks_by_ids(self, chunk_ids: List[ObjectId]):
+        """
+        Retrieves multiple chunks from the database using their IDs.
+
+        All the chunks are fetched with a single query instead of one query per ID.
+
+        Args:
+            chunk_ids (List[ObjectId]): The IDs of the chunks to retrieve.
+
+        Returns:
+            dict: The retrieved chunks keyed by their IDs, so callers can put them back in
+                  their own order. The IDs with no match are missing from it.
+        """
+        cursor = self.collection.find({
+            "_id": {"$in": chunk_ids}
+        })
+
+        return {
+            record["_id"]: DataChunk(**record)
+            async for record in cursor
+        }
+
+    async def insert_many_chunks(self, chunks: list, batch_size: int = 100,
+                                 ordered: bool = False, fast_insert: bool = True):
         """
         Inserts multiple chunks into the database in batches.
 
-        Performs bulk insertion of chunks, breaking them into batches of a specified size.
+        Performs bulk insertion of chunks, breaking them into batches of a specified size,
+        each sent as a single `insert_many` command. Unordered batches don't depend on each
+        other, so they are sent concurrently rather than one round-trip after the other, with
+        at most as many batches in flight as the client has pooled connections.
+
+        All the chunks are encoded to BSON in a single pass before batching, and the driver sends
+        the encoded documents as they are. Chunks built by trusted code can be passed as ready
+        documents (dicts), and chunks that are already BSON (RawBSONDocument) are passed through
+        untouched, e.g. when they are copied over from another collection.
 
         Args:
-            chunks (list): A list of DataChunk objects to insert.
-            batch_size (int): The number of chunks to include in each batch. Defaults to 2.
+            chunks (list): A list of DataChunk objects, or of ready chunk documents, to insert.
+            batch_size (int): The number of chunks to include in each batch. Defaults to 100.
+            ordered (bool): Whether the chunks must be inserted in order, stopping at the first
+                            failure. Defaults to False.
+            fast_insert (bool): Whether to skip waiting for the server to acknowledge the writes
+                                (write concern `w=0`). Pass False on paths that must know the
+                                chunks were stored. Defaults to True.
 
         Returns:
             int: The total number of chunks inserted.
         """
-        for i in range(0, len(chunks), batch_size):
-            batch = chunks[i:i+batch_size]
-            operations = [
-                InsertOne(chunk.dict(by_alias=True, exclude_unset=True))
-                for chunk in batch
-            ]
+        collection = self.collection
+        if fast_insert:
+            collection = collection.with_options(write_concern=WriteConcern(w=0))
+
+        docs = [
+            chunk if isinstance(chunk, (dict, RawBSONDocument)) else chunk.to_raw()
+            for chunk in chunks
+        ]
+        batches = [
+            docs[i:i+batch_size]
+            for i in range(0, len(docs), batch_size)
+        ]
+
+        if ordered:
+            for batch in batches:
+                await collection.insert_many(batch, ordered=True)
+        else:
+            # Bound the batches in flight by the connection pool size, so the extra ones wait
+            # here instead of queueing for a connection inside the driver
+            semaphore = asyncio.Semaphore(self.app_settings.MONGODB_MAX_POOL_SIZE)
 
-            await self.collection.bulk_write(operations)
+            async def insert_batch(batch: list):
+                async with semaphore:
+                    await collection.insert_many(batch, ordered=False)
+
+            await asyncio.gather(*[
+                insert_batch(batch)
+                for batch in batches
+            ])
 
         return len(chunks)
 
@@ -155,28 +222,83 @@ class ChunkModel(BaseDataModel):
         })
         return result.deleted_count
 
-    async def get_poject_chunks(self, project_id: ObjectId, page_no: int=1, page_size: int=50):
+    async def get_project_chunks(self, project_id: ObjectId, after_id: ObjectId = None, page_size: int = 50,
+                                 projection: dict = None):
         """
         Retrieves chunks associated with a specific project ID.
 
-        Retrieves a paginated list of chunks for the given project ID. The results are
-        returned based on the page number and page size provided.
+        Retrieves a page of chunks for the given project ID, ordered by `_id`. Pages are
+        addressed by the ID of the last chunk of the previous page rather than by a page
+        number, so every page is a bounded range scan on the (chunk_project_id, _id) index
+        no matter how deep it is, instead of skipping over all the preceding entries.
 
         Args:
             project_id (ObjectId): The ID of the project whose chunks are to be retrieved.
-            page_no (int): The page number for pagination. Defaults to 1.
+            after_id (ObjectId, optional): The ID of the last chunk of the previous page.
+                                           Defaults to None (first page).
             page_size (int): The number of chunks per page. Defaults to 50.
+            projection (dict, optional): The fields the server should return, e.g.
+                                         `{"chunk_text": 1, "chunk_metadata": 1, "_id": 1}`.
+                                         Defaults to None (the whole documents).
+
+        When a projection is given, the documents are returned as `RawBSONDocument` objects,
+        which skip decoding the fields nobody reads and the pydantic validation altogether.
+        Pure text retrieval can read `raw["chunk_text"]` directly, while `DataChunk.from_raw`
+        builds the full chunk when one is needed.
 
         Returns:
-            list: A list of DataChunk objects for the specified project.
+            tuple: A list of DataChunk objects for the specified project, or of RawBSONDocument
+                   objects when a projection is given, and the cursor to pass as `after_id` to
+                   get the next page (None when there are no more chunks).
         """
-        records = await self.collection.find({
-                    "chunk_project_id": project_id
-                }).skip(
-                    (page_no-1) * page_size
-                ).limit(page_size).to_list(length=None)
+        query = {"chunk_project_id": project_id}
+        if after_id is not None:
+            query["_id"] = {"$gt": after_id}
 
-        return [
+        # The projected documents miss required fields, and skipping the decoding and the
+        # validation is the point of asking for fewer fields, so they are returned raw
+        collection = self.collection
+        if projection is not None:
+            collection = collection.with_options(codec_options=_RAW_CODEC_OPTIONS)
+
+        records = await collection.find(query, projection).sort("_id", ASCENDING) \
+            .limit(page_size).to_list(length=None)
+
+        next_cursor = records[-1]["_id"] if len(records) == page_size else None
+
+        if projection is not None:
+            return records, next_cursor
+
+        chunks = [
             DataChunk(**record)
             for record in records
         ]
+
+        return chunks, next_cursor
+
+    async def iter_project_chunks(self, project_id: ObjectId, after_id: ObjectId = None, batch_size: int = 500):
+        """
+        Iterates over all chunks associated with a specific project ID.
+
+        Streams the chunks, ordered by `_id`, through a single open cursor instead of issuing
+        one skip/limit query per page, so the server walks the (chunk_project_id, _id) index
+        once and the client only holds one batch of documents in memory at a time. Callers
+        can start working on the first chunks while the following batches are still in flight.
+
+        Args:
+            project_id (ObjectId): The ID of the project whose chunks are to be iterated.
+            after_id (ObjectId, optional): Resume the iteration right after the chunk with this ID.
+                                           Defaults to None (from the first chunk).
+            batch_size (int): The number of documents fetched per server round-trip. Defaults to 500.
+
+        Yields:
+            DataChunk: The chunks of the specified project.
+        """
+        query = {"chunk_project_id": project_id}
+        if after_id is not None:
+            query["_id"] = {"$gt": after_id}
+
+        cursor = self.collection.find(query).sort("_id", ASCENDING).batch_size(batch_size)
+
+        async for record in cursor:
+            yield DataChunk(**record)
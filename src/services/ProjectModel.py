@@ -1,26 +1,39 @@
+import sys
+import asyncio
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, ReturnDocument
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from models import DataBaseEnum, Project
+from utils.lru_cache import LRUCache
 from .BaseDataModel import BaseDataModel
 
 
+# The collection name, resolved once at import instead of on every model construction
+_PROJECT_COLL = sys.intern(DataBaseEnum.COLLECTION_PROJECT_NAME.value)
+
+
 class ProjectModel(BaseDataModel):
     """
     Model class for managing project records in the database.
 
     Inherits from BaseDataModel to leverage common database functionalities.
     """
+    __slots__ = ("collection", "project_cache")
 
-    def __init__(self, db_client: object):
+    def __init__(self, db_client: AsyncIOMotorDatabase, project_cache: LRUCache = None):
         """
         Initializes the ProjectModel instance.
 
         Args:
-            db_client (object): The database client instance used to interact with the database.
+            db_client (AsyncIOMotorDatabase): The database client instance used to interact with the database.
+            project_cache (LRUCache, optional): A cache of the already retrieved projects. Defaults to None.
         """
         super().__init__(db_client=db_client)
-        self.collection = self.db_client[DataBaseEnum.COLLECTION_PROJECT_NAME.value]
+        self.collection = self.db_client[_PROJECT_COLL]
+        self.project_cache = project_cache
 
     @classmethod
-    async def create_instance(cls, db_client: object):
+    async def create_instance(cls, db_client: AsyncIOMotorDatabase, project_cache: LRUCache = None):
         """
         Class method to create an instance of the class and initialize the collection.
 
@@ -29,13 +42,14 @@ class ProjectModel(BaseDataModel):
             2. Initialize the collection associated with the instance by calling the `init_collection` method.
         
         Args:
-            db_client (object): The database client to interact with the database.
+            db_client (AsyncIOMotorDatabase): The database client to interact with the database.
+            project_cache (LRUCache, optional): A cache of the already retrieved projects. Defaults to None.
 
         Returns:
             object: The newly created instance of the class with the initialized collection.
         """
         # Create an instance of the class using the provided db_client
-        instance = cls(db_client)
+        instance = cls(db_client, project_cache=project_cache)
 
         # Initialize the collection for the instance
         await instance.init_collection()
@@ -46,36 +60,30 @@ class ProjectModel(BaseDataModel):
 
     async def init_collection(self):
         """
-        Initializes the project collection in the database by ensuring it exists.
-        If the collection does not exist, it will be created, and the appropriate indexes
-        will be added based on the Project model's index definitions.
+        Initializes the project collection in the database by creating its indexes.
+        The collection is created along with its first index if it does not exist yet.
 
         This method performs the following actions:
-            1. Checks if the project collection exists in the database.
-            2. If the collection does not exist, it is created.
-            3. Retrieves the index definitions from the Project model.
-            4. Creates each index in the project collection, ensuring proper indexing
+            1. Retrieves the index definitions from the Project model.
+            2. Creates each index in the project collection, ensuring proper indexing
             for the fields and enforcing uniqueness where specified.
+
+        Creating an index that already exists is a no-op on the server, so there is no need
+        to list the collections first. It is run once at the application startup.
         """
-        # Retrieve a list of all collection names in the database
-        all_collections = await self.db_client.list_collection_names()
-
-        # Check if the specific collection (PROJECT_COLLECTION_NAME) does not exist
-        if DataBaseEnum.COLLECTION_PROJECT_NAME.value not in all_collections:
-            # If the collection does not exist, create it by referencing the collection name
-            self.collection = self.db_client[DataBaseEnum.COLLECTION_PROJECT_NAME.value]
-
-            # Retrieve the indexes for the Project model
-            indexes = Project.get_indexes()
-
-            # Iterate over the list of indexes and create each index on the collection
-            # pylint: disable=R0801
-            for index in indexes:
-                await self.collection.create_index(
-                    index["key"],        # The fields for the index (e.g., field_name: 1 for ascending)
-                    name=index["name"],  # The name of the index (e.g., "index_name")
-                    unique=index["unique"]  # Whether the index should enforce uniqueness
-                )
+        # Retrieve the indexes for the Project model
+        indexes = Project.get_indexes()
+
+        # Create all the indexes on the collection concurrently, overlapping their round-trips
+        # pylint: disable=R0801
+        await asyncio.gather(*[
+            self.collection.create_index(
+                index["key"],        # The fields for the index (e.g., field_name: 1 for ascending)
+                name=index["name"],  # The name of the index (e.g., "index_name")
+                unique=index["unique"]  # Whether the index should enforce uniqueness
+            )
+            for index in indexes
+        ])
 
     async def create_project(self, project: Project):
         """
@@ -89,7 +97,7 @@ class ProjectModel(BaseDataModel):
         Returns:
             Project: The project with its updated ID.
         """
-        result = await self.collection.insert_one(project.dict(by_alias=True, exclude_unset=True))
+        result = await self.collection.insert_one(project.model_dump(by_alias=True, exclude_unset=True))
         project.id = result.inserted_id
         return project
 
@@ -98,7 +106,8 @@ class ProjectModel(BaseDataModel):
         Retrieves an existing project by its ID or creates a new one if it doesn't exist.
 
         Searches the collection for a project with the given ID. If no matching project is found, 
-        a new project is created and returned.
+        a new project is created and returned. Both happen in a single atomic upsert, so there is
+        one round-trip and concurrent requests for a new project can't race to create it twice.
 
         Args:
             project_id (str): The unique identifier for the project.
@@ -106,44 +115,90 @@ class ProjectModel(BaseDataModel):
         Returns:
             Project: The retrieved or newly created project.
         """
-        record = await self.collection.find_one({
-            "project_id": project_id
-        })
+        # Validate the project before upserting it, the new project is only inserted if it doesn't exist
+        project = Project(project_id=project_id)
 
-        if record is None:
-            # Create a new project if it doesn't exist
-            project = Project(project_id=project_id)
-            project = await self.create_project(project=project)
-            return project
+        record = await self.collection.find_one_and_update(
+            {"project_id": project_id},
+            {"$setOnInsert": project.model_dump(by_alias=True, exclude_unset=True)},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
 
         return Project(**record)
 
-    async def get_all_projects(self, page: int = 1, page_size: int = 10):
+    async def get_cached_project(self, project_id: str):
+        """
+        Retrieves a project from the project cache, falling back to the database on a miss.
+
+        A project never changes after its creation, so caching it saves the database
+        round-trip that every endpoint otherwise spends resolving its project.
+
+        Args:
+            project_id (str): The unique identifier for the project.
+
+        Returns:
+            Project: The retrieved or newly created project.
+        """
+        if self.project_cache is None:
+            return await self.get_project_or_create_one(project_id=project_id)
+
+        project = self.project_cache.get(project_id)
+        if project is None:
+            project = await self.get_project_or_create_one(project_id=project_id)
+            self.project_cache.set(project_id, project)
+
+        return project
+
+    async def get_all_projects(self, page: int = 1, page_size: int = 10, after_id: ObjectId = None):
         """
         Retrieves all projects from the database with pagination.
 
         Fetches projects in the specified page, limiting the projects number based on the page size.
+        When `after_id` is given, the page starts right after that project and is served by a range
+        scan on the `_id` index, so every page costs the same however deep it is, unlike skipping
+        over all the previous pages. The count and the page are fetched concurrently, so the
+        listing costs a single round-trip of latency.
 
         Args:
-            page (int): The page number to fetch. Defaults to 1.
-            page_size (int): The number of projects to fetch per page. Defaults to 10.
+            page (int): The page number to fetch, ignored when `after_id` is given. Defaults to 1,
+                        and so is any page number lower than 1.
+            page_size (int): The number of projects to fetch per page. Defaults to 10, and so is
+                             any page size lower than 1.
+            after_id (ObjectId, optional): The `_id` of the last project of the previous page. Defaults to None.
 
         Returns:
-            tuple: A list of projects and the total number of pages.
+            tuple: A list of projects, the total number of pages, and the `_id` to pass as `after_id`
+                to fetch the next page (None when there are no more projects).
         """
-        # Count the total number of documents in the collection
-        total_documents = await self.collection.count_documents({})
+        # A negative skip is rejected by the server, and a zero limit would mean no limit at all
+        page = max(page, 1)
+        page_size = page_size if page_size >= 1 else 10
+
+        # Fetch the projects for the specified page
+        if after_id is not None:
+            cursor = self.collection.find({"_id": {"$gt": after_id}}).sort("_id", ASCENDING).limit(page_size)
+        else:
+            cursor = self.collection.find().sort("_id", ASCENDING).skip((page - 1) * page_size).limit(page_size)
+
+        # Estimate the total number of documents from the collection metadata instead of scanning it,
+        # while the page is being fetched
+        total_documents, documents = await asyncio.gather(
+            self.collection.estimated_document_count(),
+            cursor.to_list(length=page_size)
+        )
+
+        projects = [
+            Project(**document)
+            for document in documents
+        ]
 
         # Calculate the total number of pages
         total_pages = total_documents // page_size
         if total_documents % page_size > 0:
             total_pages += 1
 
-        # Fetch the projects for the specified page
-        cursor = self.collection.find().skip((page - 1) * page_size).limit(page_size)
-        projects = []
-        async for document in cursor:
-            projects.append(
-                Project(**document)
-            )
-        return projects, total_pages
+        # A short page means the last project has been reached
+        next_cursor = projects[-1].id if len(projects) == page_size else None
+
+        return projects, total_pages, next_cursor
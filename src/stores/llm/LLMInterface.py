@@ -8,6 +8,7 @@ class LLMInterface(ABC):
     Concrete classes should define the actual behavior for setting models, generating text,
     embedding text, and constructing prompts.
     """
+    __slots__ = ()
 
     @abstractmethod
     def set_generation_model(self, model_id: str):
@@ -44,6 +45,54 @@ class LLMInterface(ABC):
             str: The generated text based on the prompt.
         """
 
+    @abstractmethod
+    async def a_generate_text(self, prompt: str, chat_history: list = None, max_output_tokens: int = None,
+                              temperature: float = None):
+        """
+        Asynchronously generates text based on the provided prompt.
+
+        Args:
+            prompt (str): The text prompt to generate text from.
+            chat_history (list, optional): A list of previous interactions to maintain context.
+            max_output_tokens (int, optional): The maximum number of tokens to generate.
+            temperature (float, optional): Controls the randomness of the output (0.0 for deterministic, 1.0 for creative).
+
+        Returns:
+            str: The generated text based on the prompt.
+        """
+
+    @abstractmethod
+    def stream_text(self, prompt: str, chat_history: list = None, max_output_tokens: int = None,
+                    temperature: float = None):
+        """
+        Generates text based on the provided prompt, yielding it as it is generated.
+
+        Args:
+            prompt (str): The text prompt to generate text from.
+            chat_history (list, optional): A list of previous interactions to maintain context.
+            max_output_tokens (int, optional): The maximum number of tokens to generate.
+            temperature (float, optional): Controls the randomness of the output (0.0 for deterministic, 1.0 for creative).
+
+        Yields:
+            str: The successive pieces of the generated text.
+        """
+
+    @abstractmethod
+    async def a_stream_text(self, prompt: str, chat_history: list = None, max_output_tokens: int = None,
+                            temperature: float = None):
+        """
+        Asynchronously generates text based on the provided prompt, yielding it as it is generated.
+
+        Args:
+            prompt (str): The text prompt to generate text from.
+            chat_history (list, optional): A list of previous interactions to maintain context.
+            max_output_tokens (int, optional): The maximum number of tokens to generate.
+            temperature (float, optional): Controls the randomness of the output (0.0 for deterministic, 1.0 for creative).
+
+        Yields:
+            str: The successive pieces of the generated text.
+        """
+
     @abstractmethod
     def embed_text(self, prompt: str, document_type: str = None):
         """
@@ -54,7 +103,46 @@ class LLMInterface(ABC):
             document_type (str, optional): Specifies the type of document (e.g., 'query', 'document').
 
         Returns:
-            list: The embedding vector representing the text.
+            np.ndarray: The float32 embedding vector representing the text.
+        """
+
+    @abstractmethod
+    def embed_texts(self, prompts: list, document_type: str = None):
+        """
+        Embeds multiple texts or documents.
+
+        Args:
+            prompts (list): The texts to embed.
+            document_type (str, optional): Specifies the type of the documents (e.g., 'query', 'document').
+
+        Returns:
+            list: The float32 embedding vectors (np.ndarray) representing the texts, in the same order.
+        """
+
+    @abstractmethod
+    async def a_embed_text(self, prompt: str, document_type: str = None):
+        """
+        Asynchronously embeds the provided text or document.
+
+        Args:
+            prompt (str): The text to embed.
+            document_type (str, optional): Specifies the type of document (e.g., 'query', 'document').
+
+        Returns:
+            np.ndarray: The float32 embedding vector representing the text.
+        """
+
+    @abstractmethod
+    async def a_embed_texts(self, prompts: list, document_type: str = None):
+        """
+        Asynchronously embeds multiple texts or documents.
+
+        Args:
+            prompts (list): The texts to embed.
+            document_type (str, optional): Specifies the type of the documents (e.g., 'query', 'document').
+
+        Returns:
+            list: The float32 embedding vectors (np.ndarray) representing the texts, in the same order.
         """
 
     @abstractmethod
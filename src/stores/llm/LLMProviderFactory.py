@@ -1,7 +1,66 @@
+from functools import lru_cache
 from .LLMEnums import LLMEnums
 from .providers import OpenAIProvider, CoHereProvider
 
 
+# The providers are cached by their (hashable) settings, so creating the same provider twice
+# returns the same instance, and with it the same client and its pool of connections.
+@lru_cache(maxsize=8)
+def _openai_provider(api_key: str, api_url: str, default_input_max_characters: int,  # pylint: disable=too-many-arguments
+                     default_generation_max_output_tokens: int, default_generation_temperature: float,
+                     embedding_cache_size: int, embedding_cache_dir: str, embedding_cache_ttl: float):
+    return OpenAIProvider(
+        api_key=api_key,
+        api_url=api_url,
+        default_input_max_characters=default_input_max_characters,
+        default_generation_max_output_tokens=default_generation_max_output_tokens,
+        default_generation_temperature=default_generation_temperature,
+        embedding_cache_size=embedding_cache_size,
+        embedding_cache_dir=embedding_cache_dir,
+        embedding_cache_ttl=embedding_cache_ttl
+    )
+
+
+@lru_cache(maxsize=8)
+def _cohere_provider(api_key: str, default_input_max_characters: int,  # pylint: disable=too-many-arguments
+                     default_generation_max_output_tokens: int, default_generation_temperature: float,
+                     embedding_cache_size: int, embedding_cache_dir: str, embedding_cache_ttl: float):
+    return CoHereProvider(
+        api_key=api_key,
+        default_input_max_characters=default_input_max_characters,
+        default_generation_max_output_tokens=default_generation_max_output_tokens,
+        default_generation_temperature=default_generation_temperature,
+        embedding_cache_size=embedding_cache_size,
+        embedding_cache_dir=embedding_cache_dir,
+        embedding_cache_ttl=embedding_cache_ttl
+    )
+
+
+def _build_openai(config):
+    return _openai_provider(
+        config.OPENAI_API_KEY,
+        config.OPENAI_API_URL,
+        config.INPUT_DAFAULT_MAX_CHARACTERS,
+        config.GENERATION_DAFAULT_MAX_TOKENS,
+        config.GENERATION_DAFAULT_TEMPERATURE,
+        config.EMBEDDING_CACHE_SIZE,
+        config.EMBEDDING_CACHE_DIR,
+        config.EMBEDDING_CACHE_TTL
+    )
+
+
+def _build_cohere(config):
+    return _cohere_provider(
+        config.COHERE_API_KEY,
+        config.INPUT_DAFAULT_MAX_CHARACTERS,
+        config.GENERATION_DAFAULT_MAX_TOKENS,
+        config.GENERATION_DAFAULT_TEMPERATURE,
+        config.EMBEDDING_CACHE_SIZE,
+        config.EMBEDDING_CACHE_DIR,
+        config.EMBEDDING_CACHE_TTL
+    )
+
+
 class LLMProviderFactory:
     """
     A factory class to create instances of different LLM (Large Language Model) providers.
@@ -12,6 +71,12 @@ class LLMProviderFactory:
     Attributes:
         config (dict): A dictionary containing the necessary configuration for LLM providers.
     """
+    # Maps every supported provider name to the function building its instance
+    _builders = {
+        LLMEnums.OPENAI.value: _build_openai,
+        LLMEnums.COHERE.value: _build_cohere,
+    }
+
     def __init__(self, config: dict):
         """
         Initializes the LLMProviderFactory with the provided configuration.
@@ -25,30 +90,23 @@ class LLMProviderFactory:
         """
         Creates and returns the appropriate provider instance based on the given provider name.
 
+        The provider is looked up in a dispatch table, and the instances are cached by their
+        settings, so the same provider (and its HTTP client) is reused by all the callers.
+
         Args:
             provider (str): The name of the provider to create (e.g., "OPENAI", "COHERE").
 
         Returns:
             OpenAIProvider | CoHereProvider: The corresponding provider instance, or None if the provider is invalid.
+        """
+        builder = self._builders.get(provider)
+        return builder(self.config) if builder else None
 
-        Raises:
-            ValueError: If the provider is not supported or is invalid.
+    @staticmethod
+    def clear_cache():
+        """
+        Forgets the cached provider instances, e.g. once they are closed on shutdown, so the next
+        startup in the same process creates new ones instead of reusing their closed HTTP clients.
         """
-        if provider == LLMEnums.OPENAI.value:
-            return OpenAIProvider(
-                api_key=self.config.OPENAI_API_KEY,
-                api_url=self.config.OPENAI_API_URL,
-                default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
-                default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
-            )
-
-        if provider == LLMEnums.COHERE.value:
-            return CoHereProvider(
-                api_key=self.config.COHERE_API_KEY,
-                default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
-                default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
-            )
-
-        return None
+        _openai_provider.cache_clear()
+        _cohere_provider.cache_clear()
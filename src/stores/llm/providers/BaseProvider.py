@@ -1,22 +1,72 @@
+import asyncio
+from abc import abstractmethod
+from functools import lru_cache
+import httpx
+from utils.lru_cache import LRUCache
+from utils.embedding_cache import DiskEmbeddingCache
+from utils.logger import logger
 from ..LLMInterface import LLMInterface
 
 
-class BaseProvider(LLMInterface):
-    # pylint: disable=too-many-instance-attributes
-    # pylint: disable=too-many-arguments
-    def __init__(self, api_key: str, api_url: str = None,
+# The same prompts (e.g., the system prompt, the retried or re-embedded texts) keep getting processed,
+# the limit is part of the key since every provider may have its own
+@lru_cache(maxsize=128)
+def _process_text(text: str, limit: int) -> str:
+    # Slicing past the end is a no-op, so the text is trimmed from its head without a length check
+    return text[:limit].strip()
+
+
+# The public methods are the LLMInterface ones plus the hooks every provider implements
+class BaseProvider(LLMInterface):  # pylint: disable=too-many-instance-attributes,too-many-public-methods
+    """
+    The base of the LLM providers, holding everything they have in common.
+
+    The generation and embedding flows (validating the settings, building the request, sending it
+    and reading the response), the caching and the connection pooling are all implemented here.
+    A provider only implements the abstract hooks wrapping its SDK: `create_clients`, `send_generation_request`,
+    `stream_generation_request`, `get_generated_text`, `build_embedding_request`, `send_embedding_request`
+    and `get_embeddings`, plus their async variants.
+    """
+    # The name of the provider in the logs
+    provider_name = None
+
+    # The enums of the provider (e.g., its chat roles)
+    enums = None
+
+    # The maximum number of texts the provider's embedding endpoint accepts in a single request
+    embedding_batch_size = 96
+
+    # The maximum number of embedding requests sent concurrently by the async flow
+    embedding_concurrency = 4
+
+    # The providers are long-lived and their attributes are read on every call,
+    # slots make these reads cheaper and drop the per-instance __dict__
+    __slots__ = ("api_key", "default_input_max_characters", "default_generation_max_output_tokens",
+                 "default_generation_temperature", "generation_model_id", "embedding_model_id",
+                 "embedding_size", "embedding_cache", "embedding_disk_cache", "http_client",
+                 "async_http_client", "client", "async_client")
+
+    def __init__(self, api_key: str, api_url: str = None,  # pylint: disable=too-many-arguments
                  default_input_max_characters: int = 1000,
                  default_generation_max_output_tokens: int = 1000,
-                 default_generation_temperature: float = 0.1):
+                 default_generation_temperature: float = 0.1,
+                 embedding_cache_size: int = 10000,
+                 embedding_cache_dir: str = None,
+                 embedding_cache_ttl: float = None):
         """
-        Initializes the CoHereProvider with the provided API key and optional settings.
+        Initializes the provider with the provided API key and optional settings.
 
         Args:
-            api_key (str): The API key for authentication with Cohere.
+            api_key (str): The API key for authentication with the provider.
             api_url (str, optional): The API URL (default is None).
             default_input_max_characters (int, optional): The default maximum input characters (default is 1000).
             default_generation_max_output_tokens (int, optional): The default maximum output tokens (default is 1000).
             default_generation_temperature (float, optional): The default temperature for text generation (default is 0.1).
+            embedding_cache_size (int, optional): The maximum number of embeddings kept in memory (default is 10000).
+            embedding_cache_dir (str, optional): The directory the embeddings are persisted to
+                                                 (default is None, embeddings are only cached in memory).
+            embedding_cache_ttl (float, optional): The number of seconds a persisted embedding stays valid
+                                                   (default is None, they never expire).
         """
         self.api_key = api_key
         self.default_input_max_characters = default_input_max_characters
@@ -27,6 +77,35 @@ class BaseProvider(LLMInterface):
         self.embedding_model_id = None
         self.embedding_size = None
 
+        # Pools of keep-alive connections handed to the provider's sync and async SDK clients, so the
+        # consecutive requests reuse the open TCP and TLS connections instead of handshaking every time
+        pool_limits = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0)
+        self.http_client = httpx.Client(limits=pool_limits)
+        self.async_http_client = httpx.AsyncClient(limits=pool_limits)
+
+        # The same texts (mostly the repeated queries) keep getting embedded, the cache is keyed by
+        # (embedding_model_id, document_type, prompt) so switching models never returns stale vectors
+        self.embedding_cache = LRUCache(max_size=embedding_cache_size)
+
+        # The second cache tier, it survives the restarts so the stored documents are never re-embedded
+        self.embedding_disk_cache = DiskEmbeddingCache(cache_dir=embedding_cache_dir, ttl=embedding_cache_ttl) \
+            if embedding_cache_dir else None
+
+        self.client, self.async_client = self.create_clients(api_key=api_key, api_url=api_url)
+
+    @abstractmethod
+    def create_clients(self, api_key: str, api_url: str = None):
+        """
+        Creates the sync and async SDK clients of the provider, on top of the pooled HTTP clients.
+
+        Args:
+            api_key (str): The API key for authentication with the provider.
+            api_url (str, optional): The API URL (default is None).
+
+        Returns:
+            tuple: The sync and the async clients.
+        """
+
     def set_generation_model(self, model_id: str):
         """
         Sets the generation model ID to be used for text generation.
@@ -47,6 +126,534 @@ class BaseProvider(LLMInterface):
         self.embedding_model_id = model_id
         self.embedding_size = embedding_size
 
+    def generate_text(self, prompt: str, chat_history: list = None, max_output_tokens: int = None,
+                      temperature: float = None):
+        """
+        Generates text based on the provided prompt using the set generation model.
+
+        Args:
+            prompt (str): The text prompt to generate a response for.
+            chat_history (list, optional): A list of previous messages in the chat (default is None).
+            max_output_tokens (int, optional): The maximum number of tokens to generate
+                                               (default is None, uses the class default).
+            temperature (float, optional): The temperature for controlling randomness
+                                           (default is None, uses the class default).
+
+        Returns:
+            str: The generated text, or None on error.
+        """
+        request = self._get_generation_request(prompt=prompt, chat_history=chat_history,
+                                              max_output_tokens=max_output_tokens, temperature=temperature)
+        if request is None:
+            return None
+
+        response = self.send_generation_request(request)
+
+        return self.get_generated_text(response)
+
+    async def a_generate_text(self, prompt: str, chat_history: list = None, max_output_tokens: int = None,
+                              temperature: float = None):
+        """
+        Asynchronously generates text using the set generation model, without blocking the event loop.
+
+        Args:
+            prompt (str): The text prompt to generate a response for.
+            chat_history (list, optional): A list of previous messages in the chat (default is None).
+            max_output_tokens (int, optional): The maximum number of tokens to generate
+                                               (default is None, uses the class default).
+            temperature (float, optional): The temperature for controlling randomness
+                                           (default is None, uses the class default).
+
+        Returns:
+            str: The generated text, or None on error.
+        """
+        request = self._get_generation_request(prompt=prompt, chat_history=chat_history,
+                                              max_output_tokens=max_output_tokens, temperature=temperature)
+        if request is None:
+            return None
+
+        response = await self.a_send_generation_request(request)
+
+        return self.get_generated_text(response)
+
+    def stream_text(self, prompt: str, chat_history: list = None, max_output_tokens: int = None,
+                    temperature: float = None):
+        """
+        Generates text using the set generation model, yielding it as it is generated.
+
+        The consumers (e.g., a streaming HTTP response) can start as soon as the first tokens
+        are generated, instead of waiting for the whole completion.
+
+        Args:
+            prompt (str): The text prompt to generate a response for.
+            chat_history (list, optional): A list of previous messages in the chat (default is None).
+            max_output_tokens (int, optional): The maximum number of tokens to generate
+                                               (default is None, uses the class default).
+            temperature (float, optional): The temperature for controlling randomness
+                                           (default is None, uses the class default).
+
+        Yields:
+            str: The successive pieces of the generated text, nothing on error.
+        """
+        request = self._get_generation_request(prompt=prompt, chat_history=chat_history,
+                                              max_output_tokens=max_output_tokens, temperature=temperature)
+        if request is None:
+            return
+
+        yield from self.stream_generation_request(request)
+
+    async def a_stream_text(self, prompt: str, chat_history: list = None, max_output_tokens: int = None,
+                            temperature: float = None):
+        """
+        Asynchronously generates text using the set generation model, yielding it as it is generated.
+
+        Args:
+            prompt (str): The text prompt to generate a response for.
+            chat_history (list, optional): A list of previous messages in the chat (default is None).
+            max_output_tokens (int, optional): The maximum number of tokens to generate
+                                               (default is None, uses the class default).
+            temperature (float, optional): The temperature for controlling randomness
+                                           (default is None, uses the class default).
+
+        Yields:
+            str: The successive pieces of the generated text, nothing on error.
+        """
+        request = self._get_generation_request(prompt=prompt, chat_history=chat_history,
+                                              max_output_tokens=max_output_tokens, temperature=temperature)
+        if request is None:
+            return
+
+        async for delta in self.a_stream_generation_request(request):
+            yield delta
+
+    def _get_generation_request(self, prompt: str, chat_history: list = None, max_output_tokens: int = None,
+                               temperature: float = None):
+        """
+        Builds the arguments of a chat request.
+
+        Args:
+            prompt (str): The text prompt to generate a response for.
+            chat_history (list, optional): A list of previous messages in the chat.
+            max_output_tokens (int, optional): The maximum number of tokens to generate.
+            temperature (float, optional): The temperature for controlling randomness.
+
+        Returns:
+            dict: The arguments of the request, or None if the provider isn't ready for generation.
+        """
+        if not self.client:
+            logger.error("%s client was not set", self.provider_name)
+            return None
+
+        if not self.generation_model_id:
+            logger.error("Generations model for %s was not set", self.provider_name)
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        # The chat APIs take the whole conversation, the prompt being its last message. The caller's
+        # history is copied rather than appended to, so it is never mutated
+        messages = list(chat_history) if chat_history else []
+        messages.append(
+            self.construct_prompt(prompt=prompt, role=self.enums.USER.value)
+        )
+
+        return {
+            "model": self.generation_model_id,
+            "messages": messages,
+            "max_tokens": max_output_tokens,
+            "temperature": temperature
+        }
+
+    @abstractmethod
+    def send_generation_request(self, request: dict):
+        """
+        Sends a chat request with the sync client.
+
+        Args:
+            request (dict): The arguments of the request.
+
+        Returns:
+            object: The response of the provider.
+        """
+
+    @abstractmethod
+    async def a_send_generation_request(self, request: dict):
+        """
+        Sends a chat request with the async client.
+
+        Args:
+            request (dict): The arguments of the request.
+
+        Returns:
+            object: The response of the provider.
+        """
+
+    @abstractmethod
+    def stream_generation_request(self, request: dict):
+        """
+        Sends a streaming chat request with the sync client.
+
+        Args:
+            request (dict): The arguments of the request.
+
+        Yields:
+            str: The successive pieces of the generated text.
+        """
+
+    @abstractmethod
+    async def a_stream_generation_request(self, request: dict):
+        """
+        Sends a streaming chat request with the async client.
+
+        Args:
+            request (dict): The arguments of the request.
+
+        Yields:
+            str: The successive pieces of the generated text.
+        """
+
+    @abstractmethod
+    def get_generated_text(self, response):
+        """
+        Extracts the generated text from a chat response.
+
+        Args:
+            response (object): The response of the chat request.
+
+        Returns:
+            str: The generated text, or None if the response is empty.
+        """
+
+    def embed_text(self, prompt: str, document_type: str = None):
+        """
+        Embeds the provided text using the set embedding model.
+
+        Args:
+            prompt (str): The text to embed.
+            document_type (str, optional): The type of the document (default is None).
+
+        Returns:
+            np.ndarray: The float32 embedding vector representing the input text, or None on error.
+        """
+        embeddings = self.embed_texts(prompts=[prompt], document_type=document_type)
+
+        return embeddings[0] if embeddings else None
+
+    def embed_texts(self, prompts: list, document_type: str = None):
+        """
+        Embeds the provided texts using the set embedding model.
+
+        The cached embeddings are reused, and only the remaining texts are sent to the provider, each
+        of them once however many times it is repeated, in as few requests as possible of up to
+        `embedding_batch_size` texts each.
+
+        Args:
+            prompts (list): The texts to embed.
+            document_type (str, optional): The type of the documents (default is None).
+
+        Returns:
+            list: The float32 embedding vectors (np.ndarray) representing the input texts in the same order,
+                or None on error.
+        """
+        embeddings, missing_batches = self._get_missing_batches(prompts=prompts, document_type=document_type)
+
+        for batch_indexes in missing_batches:
+            batch_prompts = [prompts[indexes[0]] for indexes in batch_indexes]
+            batch_embeddings = self._embed_batch(prompts=batch_prompts, document_type=document_type)
+
+            if not self._fill_batch_embeddings(embeddings=embeddings, batch_indexes=batch_indexes,
+                                              batch_prompts=batch_prompts, batch_embeddings=batch_embeddings,
+                                              document_type=document_type):
+                return None
+
+        return embeddings
+
+    async def a_embed_text(self, prompt: str, document_type: str = None):
+        """
+        Asynchronously embeds the provided text using the set embedding model.
+
+        Args:
+            prompt (str): The text to embed.
+            document_type (str, optional): The type of the document (default is None).
+
+        Returns:
+            np.ndarray: The float32 embedding vector representing the input text, or None on error.
+        """
+        embeddings = await self.a_embed_texts(prompts=[prompt], document_type=document_type)
+
+        return embeddings[0] if embeddings else None
+
+    async def a_embed_texts(self, prompts: list, document_type: str = None):
+        """
+        Asynchronously embeds the provided texts using the set embedding model.
+
+        Works like `embed_texts`, except that the requests for the missing batches are sent
+        concurrently, at most `embedding_concurrency` of them at a time. The disk cache reads
+        and writes block, so they run in a worker thread instead of on the event loop.
+
+        Args:
+            prompts (list): The texts to embed.
+            document_type (str, optional): The type of the documents (default is None).
+
+        Returns:
+            list: The float32 embedding vectors (np.ndarray) representing the input texts in the same order,
+                or None on error.
+        """
+        if self.embedding_disk_cache is None:
+            embeddings, missing_batches = self._get_missing_batches(prompts=prompts, document_type=document_type)
+        else:
+            embeddings, missing_batches = await asyncio.to_thread(self._get_missing_batches,
+                                                                  prompts=prompts, document_type=document_type)
+
+        batches_prompts = [[prompts[indexes[0]] for indexes in batch_indexes] for batch_indexes in missing_batches]
+
+        # Bound the requests in flight, so a large input doesn't flood the provider and hit its rate limits
+        semaphore = asyncio.Semaphore(self.embedding_concurrency)
+
+        async def embed_missing_batch(batch_prompts: list):
+            async with semaphore:
+                return await self._a_embed_batch(prompts=batch_prompts, document_type=document_type)
+
+        batches_embeddings = await asyncio.gather(*[
+            embed_missing_batch(batch_prompts)
+            for batch_prompts in batches_prompts
+        ])
+
+        def fill_embeddings():
+            return all(
+                self._fill_batch_embeddings(embeddings=embeddings, batch_indexes=batch_indexes,
+                                           batch_prompts=batch_prompts, batch_embeddings=batch_embeddings,
+                                           document_type=document_type)
+                for batch_indexes, batch_prompts, batch_embeddings in zip(missing_batches, batches_prompts,
+                                                                          batches_embeddings)
+            )
+
+        if self.embedding_disk_cache is None:
+            embedded = fill_embeddings()
+        else:
+            embedded = await asyncio.to_thread(fill_embeddings)
+
+        return embeddings if embedded else None
+
+    def _get_missing_batches(self, prompts: list, document_type: str = None):
+        """
+        Looks the texts up in the embedding caches, and splits the missing ones into batches.
+
+        The repeated missing texts are only embedded once, all their positions being grouped together.
+
+        Args:
+            prompts (list): The texts to embed.
+            document_type (str, optional): The type of the documents (default is None).
+
+        Returns:
+            tuple: The list of the cached embeddings (None for the missing ones), and the list of the
+                batches of the missing texts, each of up to `embedding_batch_size` texts given by the
+                list of their indexes among the input texts.
+        """
+        embeddings = [
+            self._get_cached_embedding(prompt=prompt, document_type=document_type)
+            for prompt in prompts
+        ]
+
+        # The dictionary keeps the order of the first occurrences, so the batches follow the input
+        missing_indexes = {}
+        for idx, (prompt, embedding) in enumerate(zip(prompts, embeddings)):
+            if embedding is None:
+                missing_indexes.setdefault(prompt, []).append(idx)
+        missing_indexes = list(missing_indexes.values())
+
+        missing_batches = [
+            missing_indexes[i:i+self.embedding_batch_size]
+            for i in range(0, len(missing_indexes), self.embedding_batch_size)
+        ]
+
+        return embeddings, missing_batches
+
+    # pylint: disable=too-many-arguments
+    def _fill_batch_embeddings(self, embeddings: list, batch_indexes: list, batch_prompts: list,
+                              batch_embeddings: list, document_type: str = None):
+        """
+        Puts the embeddings of a batch in their places among all the embeddings, and caches them.
+
+        Args:
+            embeddings (list): All the embeddings, in the order of the input texts.
+            batch_indexes (list): The indexes of each of the batch texts among the input texts.
+            batch_prompts (list): The batch texts.
+            batch_embeddings (np.ndarray): The embeddings returned by the provider for the batch, or None.
+            document_type (str, optional): The type of the documents (default is None).
+
+        Returns:
+            bool: True if the batch was embedded successfully, False otherwise.
+        """
+        if batch_embeddings is None or len(batch_embeddings) != len(batch_prompts):
+            logger.error("Error while embedding a batch of %s texts", len(batch_prompts))
+            return False
+
+        for indexes, prompt, embedding in zip(batch_indexes, batch_prompts, batch_embeddings):
+            for idx in indexes:
+                embeddings[idx] = embedding
+            self._cache_embedding(prompt=prompt, document_type=document_type, embedding=embedding)
+
+        return True
+
+    def _embed_batch(self, prompts: list, document_type: str = None):
+        """
+        Embeds a batch of texts with a single request to the provider.
+
+        Args:
+            prompts (list): The texts to embed, at most `embedding_batch_size` of them.
+            document_type (str, optional): The type of the documents (default is None).
+
+        Returns:
+            np.ndarray: The float32 embedding vectors representing the input texts in the same order,
+                or None on error.
+        """
+        request = self._get_embedding_request(prompts=prompts, document_type=document_type)
+        if request is None:
+            return None
+
+        response = self.send_embedding_request(request)
+
+        return self.get_embeddings(response)
+
+    async def _a_embed_batch(self, prompts: list, document_type: str = None):
+        """
+        Asynchronously embeds a batch of texts with a single request to the provider.
+
+        Args:
+            prompts (list): The texts to embed, at most `embedding_batch_size` of them.
+            document_type (str, optional): The type of the documents (default is None).
+
+        Returns:
+            np.ndarray: The float32 embedding vectors representing the input texts in the same order,
+                or None on error.
+        """
+        request = self._get_embedding_request(prompts=prompts, document_type=document_type)
+        if request is None:
+            return None
+
+        response = await self.a_send_embedding_request(request)
+
+        return self.get_embeddings(response)
+
+    def _get_embedding_request(self, prompts: list, document_type: str = None):
+        """
+        Builds the arguments of an embedding request.
+
+        Args:
+            prompts (list): The texts to embed.
+            document_type (str, optional): The type of the documents (default is None).
+
+        Returns:
+            dict: The arguments of the request, or None if the provider isn't ready for embedding.
+        """
+        if not self.client:
+            logger.error("%s client was not set", self.provider_name)
+            return None
+
+        if not self.embedding_model_id:
+            logger.error("Embedding model for %s was not set", self.provider_name)
+            return None
+
+        return self.build_embedding_request(texts=[self.process_text(prompt) for prompt in prompts],
+                                            document_type=document_type)
+
+    @abstractmethod
+    def build_embedding_request(self, texts: list, document_type: str = None):
+        """
+        Builds the provider specific arguments of an embedding request.
+
+        Args:
+            texts (list): The processed texts to embed.
+            document_type (str, optional): The type of the documents (default is None).
+
+        Returns:
+            dict: The arguments of the request.
+        """
+
+    @abstractmethod
+    def send_embedding_request(self, request: dict):
+        """
+        Sends an embedding request with the sync client.
+
+        Args:
+            request (dict): The arguments of the request.
+
+        Returns:
+            object: The response of the provider.
+        """
+
+    @abstractmethod
+    async def a_send_embedding_request(self, request: dict):
+        """
+        Sends an embedding request with the async client.
+
+        Args:
+            request (dict): The arguments of the request.
+
+        Returns:
+            object: The response of the provider.
+        """
+
+    @abstractmethod
+    def get_embeddings(self, response):
+        """
+        Extracts the embeddings from an embedding response, in the order of the inputs.
+
+        Args:
+            response (object): The response of the embedding request.
+
+        Returns:
+            np.ndarray: The (N, D) float32 embedding vectors, or None if the response is empty.
+        """
+
+    def _get_cached_embedding(self, prompt: str, document_type: str = None):
+        """
+        Retrieves the embedding of a text from the memory cache, then from the disk cache.
+
+        An embedding found on the disk is promoted to the memory cache.
+
+        Args:
+            prompt (str): The embedded text.
+            document_type (str, optional): The type of the document (default is None).
+
+        Returns:
+            np.ndarray: The cached float32 embedding, or None if the text wasn't embedded before.
+        """
+        cache_key = (self.embedding_model_id, document_type, prompt)
+        embedding = self.embedding_cache.get(cache_key)
+
+        if embedding is None and self.embedding_disk_cache is not None:
+            embedding = self.embedding_disk_cache.get(model_id=self.embedding_model_id,
+                                                      document_type=document_type, prompt=prompt)
+            if embedding is not None:
+                self.embedding_cache.set(cache_key, embedding)
+
+        return embedding
+
+    def _cache_embedding(self, prompt: str, document_type: str, embedding: list):
+        """
+        Stores the embedding of a text in both the memory and the disk caches.
+
+        Args:
+            prompt (str): The embedded text.
+            document_type (str): The type of the document.
+            embedding (np.ndarray): The embedding of the text.
+        """
+        self.embedding_cache.set((self.embedding_model_id, document_type, prompt), embedding)
+
+        if self.embedding_disk_cache is not None:
+            self.embedding_disk_cache.set(model_id=self.embedding_model_id, document_type=document_type,
+                                          prompt=prompt, embedding=embedding)
+
+    async def close(self):
+        """
+        Closes the pooled HTTP connections of the provider.
+        """
+        self.http_client.close()
+        await self.async_http_client.aclose()
+
     def construct_prompt(self, prompt: str, role: str):
         """
         Constructs a message prompt with the given role and processed text.
@@ -73,7 +680,4 @@ class BaseProvider(LLMInterface):
         Returns:
             str: The processed text, trimmed to the default maximum characters.
         """
-        if self.default_input_max_characters < len(text):
-            return text[self.default_input_max_characters:].strip()
-
-        return text.strip()
+        return _process_text(text, self.default_input_max_characters)
@@ -1,98 +1,164 @@
 import cohere
+import numpy as np
 from utils.logger import logger
 from ..LLMEnums import CoHereEnums, DocumentTypeEnum
 from .BaseProvider import BaseProvider
 
-# pylint: disable=too-many-instance-attributes
+
 class CoHereProvider(BaseProvider):
     """
     CoHereProvider is a provider class for interacting with the Cohere API.
     It provides methods to generate text and embed text using Cohere models.
     """
-    # pylint: disable=too-many-arguments
-    def __init__(self, api_key: str, api_url: str = None,
-                 default_input_max_characters: int = 1000,
-                 default_generation_max_output_tokens: int = 1000,
-                 default_generation_temperature: float = 0.1):
-        super().__init__(api_key, api_url, default_input_max_characters,
-                         default_generation_max_output_tokens, default_generation_temperature)
-        self.client = cohere.ClientV2(api_key=api_key)
-        self.enums = CoHereEnums
+    __slots__ = ()
+
+    provider_name = "CoHere"
+    enums = CoHereEnums
 
-    def generate_text(self, prompt: str, chat_history: list = None, max_output_tokens: int = None,
-                      temperature: float = None):
+    # The embed endpoint accepts up to 96 texts per request
+    embedding_batch_size = 96
+
+    def create_clients(self, api_key: str, api_url: str = None):
         """
-        Generates text based on the provided prompt using the set generation model.
+        Creates the sync and async Cohere clients, on top of the pooled HTTP clients.
 
         Args:
-            prompt (str): The prompt to generate text from.
-            chat_history (list, optional): A history of the chat to provide context (default is an empty list).
-            max_output_tokens (int, optional): The maximum number of tokens for the output (default is None, uses default).
-            temperature (float, optional): The temperature setting for randomness in generation
-                                           (default is None, uses default).
+            api_key (str): The API key for authentication with Cohere.
+            api_url (str, optional): The API URL, unused by Cohere (default is None).
 
         Returns:
-            str: The generated text.
+            tuple: The ClientV2 and AsyncClientV2 clients.
         """
-        # pylint: disable=duplicate-code
-        if not self.client:
-            logger.error("CoHere client was not set")
-            return None
+        return (cohere.ClientV2(api_key=api_key, httpx_client=self.http_client),
+                cohere.AsyncClientV2(api_key=api_key, httpx_client=self.async_http_client))
 
-        if not self.generation_model_id:
-            logger.error("Generations model for CoHere was not set")
-            return None
+    def send_generation_request(self, request: dict):
+        """
+        Sends a chat request.
+
+        Args:
+            request (dict): The arguments of the request.
+
+        Returns:
+            ChatResponse: The response of the request.
+        """
+        return self.client.chat(**request)
+
+    async def a_send_generation_request(self, request: dict):
+        """
+        Asynchronously sends a chat request.
+
+        Args:
+            request (dict): The arguments of the request.
+
+        Returns:
+            ChatResponse: The response of the request.
+        """
+        return await self.async_client.chat(**request)
+
+    def stream_generation_request(self, request: dict):
+        """
+        Sends a streaming chat request.
+
+        Args:
+            request (dict): The arguments of the request.
+
+        Yields:
+            str: The successive pieces of the generated text.
+        """
+        for event in self.client.chat_stream(**request):
+            if event.type == "content-delta":
+                yield event.delta.message.content.text
+
+    async def a_stream_generation_request(self, request: dict):
+        """
+        Asynchronously sends a streaming chat request.
+
+        Args:
+            request (dict): The arguments of the request.
 
-        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
-        temperature = temperature if temperature else self.default_generation_temperature
+        Yields:
+            str: The successive pieces of the generated text.
+        """
+        async for event in self.async_client.chat_stream(**request):
+            if event.type == "content-delta":
+                yield event.delta.message.content.text
 
-        response = self.client.chat(
-            model=self.generation_model_id,
-            chat_history=chat_history,
-            message=self.process_text(prompt),
-            temperature=temperature,
-            max_tokens=max_output_tokens
-        )
+    def get_generated_text(self, response):
+        """
+        Extracts the generated text from a chat response.
 
-        if not response or not response.text:
+        Args:
+            response (ChatResponse): The response of the chat request.
+
+        Returns:
+            str: The generated text, or None if the response is empty.
+        """
+        if not response or not response.message or not response.message.content:
             logger.error("Error while generating text with CoHere")
             return None
 
-        return response.choices[0].message["content"]
+        return response.message.content[0].text
 
-    def embed_text(self, prompt: str, document_type: str = None):
+    def build_embedding_request(self, texts: list, document_type: str = None):
         """
-        Embeds the provided text prompt using the set embedding model.
+        Builds the arguments of an embed request.
 
         Args:
-            prompt (str): The text to be embedded.
+            texts (list): The processed texts to embed.
             document_type (str, optional): The type of document (default is None, uses the default type).
 
         Returns:
-            list: The embedding of the text.
+            dict: The arguments of the request.
         """
-        if not self.client:
-            logger.error("CoHere client was not set")
-            return None
+        input_type = CoHereEnums.DOCUMENT.value
 
-        if not self.embedding_model_id:
-            logger.error("Embedding model for CoHere was not set")
-            return None
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnums.QUERY.value
 
-        input_type = CoHereEnums.DOCUMENT
+        return {
+            "texts": texts,
+            "model": self.embedding_model_id,
+            "input_type": input_type,
+            "embedding_types": ["float"]
+        }
 
-        if document_type == DocumentTypeEnum.QUERY:
-            input_type = CoHereEnums.QUERY
+    def send_embedding_request(self, request: dict):
+        """
+        Sends an embed request.
 
-        response = self.client.embed(
-            texts=[self.process_text(prompt)],
-            model=self.embedding_model_id,
-            input_type=input_type,
-            embedding_types=['float']
-        )
+        Args:
+            request (dict): The arguments of the request.
+
+        Returns:
+            EmbedByTypeResponse: The response of the request.
+        """
+        return self.client.embed(**request)
 
+    async def a_send_embedding_request(self, request: dict):
+        """
+        Asynchronously sends an embed request.
+
+        Args:
+            request (dict): The arguments of the request.
+
+        Returns:
+            EmbedByTypeResponse: The response of the request.
+        """
+        return await self.async_client.embed(**request)
+
+    def get_embeddings(self, response):
+        """
+        Extracts the embeddings from an embed response.
+
+        Args:
+            response (EmbedByTypeResponse): The response of the embed request.
+
+        Returns:
+            np.ndarray: The (N, D) float32 embeddings of the texts, or None if the response is empty.
+        """
         if not response or not response.embeddings or not response.embeddings.float_:
             logger.error("Error while embedding text with CoHere")
             return None
 
-        return response.embeddings.float[0]
+        return np.asarray(response.embeddings.float_, dtype=np.float32)
@@ -1,10 +1,10 @@
-from openai import OpenAI
+import numpy as np
+from openai import OpenAI, AsyncOpenAI
 from utils.logger import logger
 from ..LLMEnums import OpenAIEnums
 from .BaseProvider import BaseProvider
 
 
-# pylint: disable=too-many-instance-attributes
 class OpenAIProvider(BaseProvider):
     """
     A provider class for interacting with OpenAI's API, implementing the LLMInterface.
@@ -13,94 +13,153 @@ class OpenAIProvider(BaseProvider):
     using the specified models. It also manages configuration parameters such as maximum characters,
     output tokens, and temperature for generation.
     """
-    # pylint: disable=too-many-arguments
-    def __init__(self, api_key: str, api_url: str = None,
-                 default_input_max_characters: int = 1000,
-                 default_generation_max_output_tokens: int = 1000,
-                 default_generation_temperature: float = 0.1):
-        super().__init__(api_key, api_url, default_input_max_characters,
-                         default_generation_max_output_tokens, default_generation_temperature)
-        self.client = OpenAI(api_key=api_key,
-                             base_url=api_url if api_url and len(api_url) else None)
-        self.enums = OpenAIEnums
-
-    def generate_text(self, prompt: str, chat_history: list = None, max_output_tokens: int = None,
-                      temperature: float = None):
-        """
-        Generates text using the OpenAI model based on the provided prompt and other parameters.
+    __slots__ = ()
+
+    provider_name = "OpenAi"
+    enums = OpenAIEnums
+
+    # The embeddings endpoint accepts up to 2048 inputs, a lower bound keeps the requests reasonably sized
+    embedding_batch_size = 512
+
+    def create_clients(self, api_key: str, api_url: str = None):
+        """
+        Creates the sync and async OpenAI clients, on top of the pooled HTTP clients.
 
         Args:
-            prompt (str): The text prompt to generate a response for.
-            chat_history (list, optional): A list of previous messages in the chat (default is an empty list).
-            max_output_tokens (int, optional): The maximum number of tokens to generate
-                                               (default is None, uses the class default).
-            temperature (float, optional): The temperature for controlling randomness
-                                           (default is None, uses the class default).
+            api_key (str): The API key for authentication with OpenAI.
+            api_url (str, optional): The API URL (default is None, uses OpenAI's).
 
         Returns:
-            str: The generated text from OpenAI's API response.
+            tuple: The OpenAI and AsyncOpenAI clients.
+        """
+        base_url = api_url if api_url and len(api_url) else None
+
+        return (OpenAI(api_key=api_key, base_url=base_url, http_client=self.http_client),
+                AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=self.async_http_client))
 
-        Raises:
-            None: Returns None if there is an error in the API response or client setup.
+    def send_generation_request(self, request: dict):
         """
-        # pylint: disable=duplicate-code
-        if not self.client:
-            logger.error("OpenAi client was not set")
-            return None
+        Sends a chat completion request.
 
-        if not self.generation_model_id:
-            logger.error("Generations model for OpenAi was not set")
-            return None
+        Args:
+            request (dict): The arguments of the request.
 
-        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
-        temperature = temperature if temperature else self.default_generation_temperature
+        Returns:
+            ChatCompletion: The response of the request.
+        """
+        return self.client.chat.completions.create(**request)
 
-        chat_history.append(
-            self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
-        )
+    async def a_send_generation_request(self, request: dict):
+        """
+        Asynchronously sends a chat completion request.
 
-        response = self.client.chat.completions.create(
-            model=self.generation_model_id,
-            messages=chat_history,
-            max_tokens=max_output_tokens,
-            temperature=temperature
-        )
+        Args:
+            request (dict): The arguments of the request.
 
+        Returns:
+            ChatCompletion: The response of the request.
+        """
+        return await self.async_client.chat.completions.create(**request)
+
+    def stream_generation_request(self, request: dict):
+        """
+        Sends a streaming chat completion request.
+
+        Args:
+            request (dict): The arguments of the request.
+
+        Yields:
+            str: The successive pieces of the generated text.
+        """
+        for chunk in self.client.chat.completions.create(**request, stream=True):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def a_stream_generation_request(self, request: dict):
+        """
+        Asynchronously sends a streaming chat completion request.
+
+        Args:
+            request (dict): The arguments of the request.
+
+        Yields:
+            str: The successive pieces of the generated text.
+        """
+        async for chunk in await self.async_client.chat.completions.create(**request, stream=True):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def get_generated_text(self, response):
+        """
+        Extracts the generated text from a chat completion response.
+
+        Args:
+            response (ChatCompletion): The response of the chat completion request.
+
+        Returns:
+            str: The generated text, or None if the response is empty.
+        """
         if not response or not response.choices or len(response.choices) == 0 or not response.choices[0].message:
             logger.error("Error while generating text with OpenAI")
             return None
 
         return response.choices[0].message.content
 
-    def embed_text(self, prompt: str, document_type: str = None):
+    def build_embedding_request(self, texts: list, document_type: str = None):
         """
-        Embeds the provided text using OpenAI's embedding model.
+        Builds the arguments of an embeddings request.
 
         Args:
-            prompt (str): The text to embed.
-            document_type (str, optional): The type of the document (default is None).
+            texts (list): The processed texts to embed.
+            document_type (str, optional): The type of the documents, unused by OpenAI (default is None).
 
         Returns:
-            list: The embedding vector representing the input text.
+            dict: The arguments of the request.
+        """
+        return {
+            "model": self.embedding_model_id,
+            "input": texts
+        }
 
-        Raises:
-            None: Returns None if there is an error in the API response or client setup.
+    def send_embedding_request(self, request: dict):
         """
-        if not self.client:
-            logger.error("OpenAi client was not set")
-            return None
+        Sends an embeddings request.
 
-        if not self.embedding_model_id:
-            logger.error("Embedding model for OpenAi was not set")
-            return None
+        Args:
+            request (dict): The arguments of the request.
+
+        Returns:
+            CreateEmbeddingResponse: The response of the request.
+        """
+        return self.client.embeddings.create(**request)
+
+    async def a_send_embedding_request(self, request: dict):
+        """
+        Asynchronously sends an embeddings request.
 
-        response = self.client.embeddings.create(
-            model=self.embedding_model_id,
-            input=prompt
-        )
+        Args:
+            request (dict): The arguments of the request.
+
+        Returns:
+            CreateEmbeddingResponse: The response of the request.
+        """
+        return await self.async_client.embeddings.create(**request)
 
-        if not response or not response.data or len(response.data) == 0 or not response.data[0].embedding:
+    def get_embeddings(self, response):
+        """
+        Extracts the embeddings from an embeddings response, in the order of the inputs.
+
+        Args:
+            response (CreateEmbeddingResponse): The response of the embeddings request.
+
+        Returns:
+            np.ndarray: The (N, D) float32 embedding vectors, or None if the response is empty.
+        """
+        if not response or not response.data or len(response.data) == 0:
             logger.error("Error while embedding text with OpenAI")
             return None
 
-        return response.data[0].embedding
+        return np.asarray([
+            record.embedding
+            for record in sorted(response.data, key=lambda record: record.index)
+        ], dtype=np.float32)
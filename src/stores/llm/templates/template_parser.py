@@ -1,4 +1,6 @@
 import os
+import importlib
+from string import Template
 
 class TemplateParser:
     """
@@ -8,6 +10,9 @@ class TemplateParser:
         current_path (str): The directory path of the current script.
         default_language (str): The fallback language to use when a specified language is unavailable.
         language (str): The currently set language for parsing templates.
+        template_cache (dict): The compiled templates (see `compile_template`), keyed by (language, group, key).
+        module_cache (dict): The imported groups modules, keyed by (language, group).
+        language_groups (dict): The groups (files) available in each loaded language.
     """
 
     def __init__(self, language: str = None, default_language='en'):
@@ -21,12 +26,15 @@ class TemplateParser:
         self.current_path = os.path.dirname(os.path.abspath(__file__))
         self.default_language = default_language
         self.language = None
+        self.template_cache = {}
+        self.module_cache = {}
+        self.language_groups = {}
         self.set_language(language=language)
 
     def set_language(self, language: str):
         """
         Sets the current language for the parser. Falls back to the default language if the specified language
-        is unavailable.
+        is unavailable. The templates of both languages are eagerly loaded into the template cache.
 
         Args:
             language (str): The preferred language to set.
@@ -34,19 +42,22 @@ class TemplateParser:
         Raises:
             None: This method handles missing language paths gracefully.
         """
-        if not language:
-            self.language = self.default_language
-
-        language_path = os.path.join(self.current_path, "locales", language)
-        if language and os.path.exists(language_path):
+        if language and os.path.isdir(os.path.join(self.current_path, "locales", language)):
             self.language = language
         else:
             self.language = self.default_language
 
+        for targeted_language in dict.fromkeys((self.language, self.default_language)):
+            if targeted_language not in self.language_groups:
+                self.load_templates(language=targeted_language)
+
     def get(self, group: str, key: str, variables: dict = None):
         """
         Retrieves a template string from the specified group and key, replacing placeholders with values from variables.
 
+        The templates are looked up in the cache filled by `set_language`, in the current language first
+        then in the default language, so no module is imported nor any file checked on this path.
+
         Args:
             group (str): The name of the group (file) containing the template.
             key (str): The key corresponding to the desired template within the group.
@@ -60,21 +71,101 @@ class TemplateParser:
         if not group or not key:
             return None
 
-        group_path = os.path.join(self.current_path, "locales", self.language, f"{group}.py")
-        targeted_language = self.language
-
-        if not os.path.exists(group_path):
-            group_path = os.path.join(self.current_path, "locales", self.default_language, f"{group}.py")
-            targeted_language = self.default_language
-        if not os.path.exists(group_path):
+        template = self.template_cache.get((self.language, group, key))
+        if template is None:
+            template = self.template_cache.get((self.default_language, group, key))
+        if template is None:
             return None
 
-        # Import the group module dynamically
-        module = __import__(
-            f"stores.llm.templates.locales.{targeted_language}.{group}", fromlist=[group]
-        )
-        if not module:
-            return None
+        format_string, rendered = template
+
+        # The templates without placeholders were already rendered when they were loaded
+        if rendered is not None:
+            return rendered
+
+        return format_string.format_map(variables or {})
+
+    def load_templates(self, language: str):
+        """
+        Loads all the templates of a language into the template cache.
+
+        The language directory is listed once to resolve its groups (files), every group is
+        imported once, and each of its templates is cached under the (language, group, key) key.
+
+        Args:
+            language (str): The language whose templates are loaded.
+        """
+        language_path = os.path.join(self.current_path, "locales", language)
+        if not os.path.isdir(language_path):
+            self.language_groups[language] = []
+            return
+
+        self.language_groups[language] = [
+            group
+            for group, extension in map(os.path.splitext, os.listdir(language_path))
+            if extension == ".py" and not group.startswith("__")
+        ]
+
+        for group in self.language_groups[language]:
+            module = self.get_group_module(language=language, group=group)
+
+            for key, value in vars(module).items():
+                if isinstance(value, Template):
+                    self.template_cache[(language, group, key)] = self.compile_template(value)
+
+    @staticmethod
+    def compile_template(template: Template):
+        """
+        Compiles a template to a `str.format` string, which is substituted without running a regex.
+
+        Args:
+            template (Template): The template to compile.
+
+        Returns:
+            tuple: The format string, and the rendered template if it has no placeholders (None otherwise).
+
+        Raises:
+            ValueError: If the template contains an invalid placeholder.
+        """
+        parts = []
+        has_placeholders = False
+        last_end = 0
+
+        for match in template.pattern.finditer(template.template):
+            # The literal text is escaped, so its braces aren't taken for replacement fields
+            parts.append(template.template[last_end:match.start()].replace("{", "{{").replace("}", "}}"))
+            last_end = match.end()
+
+            name = match.group("named") or match.group("braced")
+            if name is not None:
+                parts.append("{" + name + "}")
+                has_placeholders = True
+            elif match.group("escaped") is not None:
+                parts.append(template.delimiter)
+            else:
+                raise ValueError(f"Invalid placeholder in template: {template.template!r}")
+
+        parts.append(template.template[last_end:].replace("{", "{{").replace("}", "}}"))
+        format_string = "".join(parts)
+
+        return format_string, None if has_placeholders else format_string.format_map({})
+
+    def get_group_module(self, language: str, group: str):
+        """
+        Imports the module of a templates group, once.
+
+        Args:
+            language (str): The language of the group.
+            group (str): The name of the group (file).
+
+        Returns:
+            module: The imported group module.
+        """
+        module_key = (language, group)
+        module = self.module_cache.get(module_key)
+
+        if module is None:
+            module = importlib.import_module(f"stores.llm.templates.locales.{language}.{group}")
+            self.module_cache[module_key] = module
 
-        key_attribute = getattr(module, key)
-        return key_attribute.substitute(variables)
+        return module
@@ -1,14 +1,19 @@
 from enum import Enum
 
-class VectorDBEnums(Enum):
+class VectorDBEnums(str, Enum):
     """
     Enum for different types of vector databases.
+
+    The members are strings themselves, so they compare equal to the configured values.
     """
     QDRANT = "QDRANT"
 
-class DistanceMethodEnums(Enum):
+class DistanceMethodEnums(str, Enum):
     """
     Enum for different distance calculation methods used in vector search.
+
+    The members are strings themselves, so they compare equal to the configured values.
     """
     COSINE = "cosine"
     DOT = "dot"
+    EUCLID = "euclid"
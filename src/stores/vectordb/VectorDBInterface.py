@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Union
+import numpy as np
 from models import RetrievedDocument
 
 class VectorDBInterface(ABC):
@@ -17,9 +18,9 @@ class VectorDBInterface(ABC):
         """
 
     @abstractmethod
-    def disconnect(self):
+    async def disconnect(self):
         """
-        Disconnects from the vector database.
+        Disconnects from the vector database, closing its connections.
         """
 
     @abstractmethod
@@ -67,7 +68,8 @@ class VectorDBInterface(ABC):
     @abstractmethod
     def create_collection(self, collection_name: str,
                           embedding_size: int,
-                          do_reset: bool = False):
+                          do_reset: bool = False,
+                          bulk_mode: bool = False):
         """
         Creates a new collection in the vector database.
 
@@ -75,12 +77,23 @@ class VectorDBInterface(ABC):
             collection_name (str): The name of the collection to create.
             embedding_size (int): The size of the vectors to be stored in the collection.
             do_reset (bool, optional): Whether to reset the collection if it already exists. Defaults to False.
+            bulk_mode (bool, optional): Whether to defer the indexing of the collection until it is finalized,
+                                        for faster bulk inserts. Defaults to False.
+        """
+
+    @abstractmethod
+    def finalize_collection(self, collection_name: str):
+        """
+        Enables the indexing of a collection created in bulk mode, once its records are inserted.
+
+        Args:
+            collection_name (str): The name of the collection to finalize.
         """
 
     # pylint: disable=too-many-arguments
     @abstractmethod
     def insert_one(self, collection_name: str,
-                   text: str, vector: list,
+                   text: str, vector: Union[list, np.ndarray],
                    metadata: dict = None,
                    record_id: str = None):
         """
@@ -89,7 +102,7 @@ class VectorDBInterface(ABC):
         Args:
             collection_name (str): The name of the collection to insert the record into.
             text (str): The text to insert.
-            vector (list): The vector representation of the text.
+            vector (list | np.ndarray): The vector representation of the text.
             metadata (dict, optional): Additional metadata associated with the record. Defaults to None.
             record_id (str, optional): An optional unique record identifier. Defaults to None.
         """
@@ -98,32 +111,70 @@ class VectorDBInterface(ABC):
     @abstractmethod
     def insert_many(self, collection_name: str,
                     texts: list,
-                    vectors: list,
+                    vectors: Union[list, np.ndarray],
                     metadata: list = None,
                     record_ids: list = None,
-                    batch_size: int = 50):
+                    batch_size: int = None):
         """
         Inserts multiple records into a collection.
 
         Args:
             collection_name (str): The name of the collection to insert the records into.
             texts (list): A list of texts to insert.
-            vectors (list): A list of vector representations of the texts.
+            vectors (list | np.ndarray): The vector representations of the texts, as a list or a (N, D) array.
+            metadata (list, optional): A list of metadata for the records. Defaults to None.
+            record_ids (list, optional): A list of unique record identifiers. Defaults to None.
+            batch_size (int, optional): The number of records to insert per batch. Defaults to None
+                                        (the provider's default batch size).
+        """
+
+    # pylint: disable=too-many-arguments
+    @abstractmethod
+    async def insert_many_async(self, collection_name: str,
+                                texts: list,
+                                vectors: Union[list, np.ndarray],
+                                metadata: list = None,
+                                record_ids: list = None,
+                                batch_size: int = None):
+        """
+        Asynchronously inserts multiple records into a collection, uploading several batches concurrently.
+
+        Args:
+            collection_name (str): The name of the collection to insert the records into.
+            texts (list): A list of texts to insert.
+            vectors (list | np.ndarray): The vector representations of the texts, as a list or a (N, D) array.
             metadata (list, optional): A list of metadata for the records. Defaults to None.
             record_ids (list, optional): A list of unique record identifiers. Defaults to None.
-            batch_size (int, optional): The number of records to insert per batch. Defaults to 50.
+            batch_size (int, optional): The number of records to insert per batch. Defaults to None
+                                        (the provider's default batch size).
         """
 
     @abstractmethod
-    def search_by_vector(self, collection_name: str, vector: list, limit: int) -> List[RetrievedDocument]:
+    def search_by_vector(self, collection_name: str, vector: Union[list, np.ndarray],
+                         limit: int) -> List[RetrievedDocument]:
         """
         Searches for similar vectors within a collection using a query vector.
 
         Args:
             collection_name (str): The name of the collection to search.
-            vector (list): The vector to use as the query.
+            vector (list | np.ndarray): The vector to use as the query.
             limit (int): The maximum number of results to return.
 
         Returns:
             List: A list of search results.
         """
+
+    @abstractmethod
+    def search_batch(self, collection_name: str, vectors: Union[List[list], np.ndarray],
+                     limit: int) -> List[List[RetrievedDocument]]:
+        """
+        Searches for similar vectors within a collection for several query vectors, with a single request.
+
+        Args:
+            collection_name (str): The name of the collection to search.
+            vectors (List[list] | np.ndarray): The vectors to use as the queries.
+            limit (int): The maximum number of results to return per query.
+
+        Returns:
+            List: A list of search results per query vector, in the same order.
+        """
@@ -35,12 +35,16 @@ class VectorDBProviderFactory:
             ValueError: If the provider type is not recognized.
         """
 
-        if provider == VectorDBEnums.QDRANT.value:
+        if provider == VectorDBEnums.QDRANT:
             db_url = self.config.VECTOR_DB_URL
 
             return QdrantDBProvider(
                 db_url=db_url,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                upload_concurrency=self.config.VECTOR_DB_UPLOAD_CONCURRENCY,
+                default_batch_size=self.config.VECTOR_DB_BATCH_SIZE,
+                grpc_port=self.config.VECTOR_DB_GRPC_PORT,
+                quantization=self.config.VECTOR_DB_QUANTIZATION,
             )
 
         return None
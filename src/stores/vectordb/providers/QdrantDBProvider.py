@@ -1,51 +1,124 @@
-from typing import List
-from qdrant_client import models, QdrantClient
+import uuid
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import repeat
+from typing import List, Union
+import grpc
+import numpy as np
+from qdrant_client import models, QdrantClient, AsyncQdrantClient
+from qdrant_client.http.exceptions import UnexpectedResponse
 from utils.logger import logger
+from utils.lru_cache import LRUCache
 from models import RetrievedDocument
 from ..VectorDBInterface import VectorDBInterface
 from ..VectorDBEnums import DistanceMethodEnums
 
 
-class QdrantDBProvider(VectorDBInterface):
+# Maps every supported distance method to its Qdrant distance, the enum members being strings
+# they also match the configured values
+_DIST_MAP = {
+    DistanceMethodEnums.COSINE: models.Distance.COSINE,
+    DistanceMethodEnums.DOT: models.Distance.DOT,
+    DistanceMethodEnums.EUCLID: models.Distance.EUCLID,
+}
+
+class QdrantDBProvider(VectorDBInterface):  # pylint: disable=too-many-instance-attributes
     """
     QdrantDBProvider is a concrete implementation of the VectorDBInterface using Qdrant as the vector database.
 
     This class handles interaction with the Qdrant vector database, including connecting, disconnecting,
     checking collections, and inserting or searching records.
     """
+    # The HNSW and indexing settings of Qdrant's defaults, restored once a bulk mode collection is finalized
+    default_hnsw_m = 16
+    default_indexing_threshold = 20000
 
-    def __init__(self, db_url: str, distance_method: str):
+    def __init__(self, db_url: str, distance_method: str, upload_concurrency: int = 4,  # pylint: disable=too-many-arguments
+                 default_batch_size: int = 256, grpc_port: int = None, quantization: bool = True,
+                 collection_cache_ttl: float = 300):
         """
         Initializes the QdrantDBProvider with the given database path and distance method.
 
         Args:
             db_path (str): The path to the Qdrant database.
-            distance_method (str): The distance metric to use (e.g., 'cosine' or 'dot').
+            distance_method (str): The distance metric to use ('cosine', 'dot' or 'euclid').
+            upload_concurrency (int, optional): The maximum number of batches uploaded at once by
+                                                `insert_many` and `insert_many_async`. Defaults to 4.
+            default_batch_size (int, optional): The number of records uploaded per request when the
+                                                caller doesn't set it. Defaults to 256.
+            grpc_port (int, optional): The gRPC port of the database, the clients prefer gRPC over
+                                       REST when it is set. Defaults to None (REST only).
+            quantization (bool, optional): Whether the collections are searched through an int8 copy of
+                                           their vectors. Defaults to True.
+            collection_cache_ttl (float, optional): The number of seconds the existence of a collection is
+                                                    cached for. Defaults to 300.
+
+        Raises:
+            ValueError: If the distance method isn't supported.
         """
         self.client = None
+        self.async_client = None
+        self.upload_executor = None
         self.db_url = db_url
-        self.distance_method = None
+        self.upload_concurrency = upload_concurrency
+        self.default_batch_size = default_batch_size
+        self.grpc_port = grpc_port
+        self.quantization = quantization
+
+        # The collections are (almost) never deleted, so their existence is cached instead of being
+        # checked with a round trip before every insert. Only the existing collections are cached
+        self.collection_cache = LRUCache(max_size=1024, ttl=collection_cache_ttl)
 
-        if distance_method == DistanceMethodEnums.COSINE.value:
-            self.distance_method = models.Distance.COSINE
-        elif distance_method == DistanceMethodEnums.DOT.value:
-            self.distance_method = models.Distance.DOT
+        # An unknown method is reported at startup, instead of by the first collection creation
+        self.distance_method = _DIST_MAP.get(distance_method)
+        if self.distance_method is None:
+            raise ValueError(f"Unknown distance method: {distance_method}")
 
     def connect(self):
         """
         Establishes a connection to the Qdrant database.
+
+        An async client is created alongside the sync one, it is used for the bulk uploads
+        so they don't block the event loop. When a gRPC port is set, both clients send the
+        vectors as protobuf over gRPC, which is smaller and cheaper to encode than REST's JSON.
+
+        The clients are long-lived and keep their connections open, so connecting again reuses
+        them instead of reopening the connections (and redoing the handshakes). So is the pool of
+        threads `insert_many` uploads its batches from.
         """
-        self.client = QdrantClient(url=self.db_url)
+        if self.client is not None and self.async_client is not None:
+            return
+
+        self.upload_executor = ThreadPoolExecutor(max_workers=self.upload_concurrency)
 
-    def disconnect(self):
+        client_kwargs = {"url": self.db_url, "timeout": 60}
+        if self.grpc_port:
+            client_kwargs.update(prefer_grpc=True, grpc_port=self.grpc_port)
+
+        self.client = QdrantClient(**client_kwargs)
+        self.async_client = AsyncQdrantClient(**client_kwargs)
+
+    async def disconnect(self):
         """
-        Disconnects from the Qdrant database by setting the client to None.
+        Disconnects from the Qdrant database, closing the connections of both clients.
+
+        The pool of upload threads is shut down first, so the uploads in flight complete.
         """
+        if self.upload_executor is not None:
+            self.upload_executor.shutdown(wait=True)
+        if self.client is not None:
+            self.client.close()
+        if self.async_client is not None:
+            await self.async_client.close()
+
         self.client = None
+        self.async_client = None
+        self.upload_executor = None
+        self.collection_cache.clear()
 
     def is_collection_existed(self, collection_name: str) -> bool:
         """
-        Checks if a collection exists in the database.
+        Checks if a collection exists in the database, or in the cache of the existing collections.
 
         Args:
             collection_name (str): The name of the collection to check.
@@ -53,7 +126,14 @@ class QdrantDBProvider(VectorDBInterface):
         Returns:
             bool: True if the collection exists, False otherwise.
         """
-        return self.client.collection_exists(collection_name=collection_name)
+        if self.collection_cache.get(collection_name):
+            return True
+
+        is_existed = self.client.collection_exists(collection_name=collection_name)
+        if is_existed:
+            self.collection_cache.set(collection_name, True)
+
+        return is_existed
 
     def list_all_collections(self) -> List:
         """
@@ -84,53 +164,172 @@ class QdrantDBProvider(VectorDBInterface):
             collection_name (str): The name of the collection to delete.
         """
         if self.is_collection_existed(collection_name):
+            _ = self.collection_cache.pop(collection_name)
             return self.client.delete_collection(collection_name=collection_name)
         return None
 
-    def create_collection(self, collection_name: str, embedding_size: int, do_reset: bool = False):
+    def create_collection(self, collection_name: str, embedding_size: int, do_reset: bool = False,
+                          bulk_mode: bool = False):
         """
         Creates a new collection in the database.
 
+        With quantization, the search scans an int8 copy of the vectors (4x smaller than float32)
+        pinned in RAM, while the original vectors, only read to rescore the best candidates, are
+        kept on disk.
+
+        In bulk mode, the collection is created without its HNSW graph nor indexing, so the inserted
+        points are only stored instead of being linked into the graph one batch at a time. The graph
+        is built once, by `finalize_collection`.
+
         Args:
             collection_name (str): The name of the collection to create.
             embedding_size (int): The size of the vector embeddings.
             do_reset (bool, optional): Whether to reset an existing collection. Defaults to False.
+            bulk_mode (bool, optional): Whether to defer the indexing until the collection is finalized.
+                                        Defaults to False.
 
         Returns:
             bool: True if the collection was created, False if the collection already exists.
         """
         if do_reset:
             _ = self.delete_collection(collection_name=collection_name)
+        elif self.collection_cache.get(collection_name):
+            return False
 
-        if not self.is_collection_existed(collection_name):
+        # The collection is created right away, and an existing one is reported by the error of the
+        # request, so a single round trip is needed and no other creation can slip in between
+        try:
             _ = self.client.create_collection(
                 collection_name=collection_name,
                 vectors_config=models.VectorParams(
                     size=embedding_size,
-                    distance=self.distance_method
-                )
+                    distance=self.distance_method,
+                    on_disk=self.quantization
+                ),
+                quantization_config=models.ScalarQuantization(
+                    scalar=models.ScalarQuantizationConfig(
+                        type=models.ScalarType.INT8,
+                        quantile=0.99,
+                        always_ram=True
+                    )
+                ) if self.quantization else None,
+                hnsw_config=models.HnswConfigDiff(m=0) if bulk_mode else None,
+                optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0) if bulk_mode else None
             )
-            return True
+        except (UnexpectedResponse, grpc.RpcError) as e:
+            if not self.is_already_exists_error(e):
+                raise
+
+            self.collection_cache.set(collection_name, True)
+            return False
+
+        self.collection_cache.set(collection_name, True)
+        return True
+
+    @staticmethod
+    def is_already_exists_error(error: Exception) -> bool:
+        """
+        Checks if the error of a collection creation reports that the collection already exists.
+
+        Args:
+            error (UnexpectedResponse | grpc.RpcError): The error raised by the REST or the gRPC client.
+
+        Returns:
+            bool: True if the collection already exists, False for any other error.
+        """
+        if isinstance(error, grpc.RpcError):
+            return error.code() == grpc.StatusCode.ALREADY_EXISTS
+
+        # Qdrant answers with a conflict, the older versions with a bad request naming the reason
+        return error.status_code == 409 or \
+            (error.status_code == 400 and b"already exists" in (error.content or b""))
+
+    @staticmethod
+    def is_not_found_error(error: Exception) -> bool:
+        """
+        Checks if an error reports that the requested collection doesn't exist.
+
+        Args:
+            error (Exception): The error raised by the client.
 
-        return False
+        Returns:
+            bool: True if the collection doesn't exist, False for any other error.
+        """
+        if isinstance(error, grpc.RpcError):
+            return error.code() == grpc.StatusCode.NOT_FOUND
+
+        return isinstance(error, UnexpectedResponse) and error.status_code == 404
+
+    def forget_missing_collection(self, collection_name: str, error: Exception):
+        """
+        Drops a collection from the cache of the existing collections when an error reports it missing.
+
+        The cache belongs to the process, so a collection deleted through another worker stays cached
+        here until it expires. Forgetting it lets the next `create_collection` create it again.
+
+        Args:
+            collection_name (str): The name of the collection the failed request targeted.
+            error (Exception): The error raised by the client.
+        """
+        if self.is_not_found_error(error):
+            _ = self.collection_cache.pop(collection_name)
+
+    def finalize_collection(self, collection_name: str):
+        """
+        Enables the HNSW graph and the indexing of a collection created in bulk mode.
+
+        Only the settings disabled by the bulk mode are restored (to Qdrant's defaults), so a collection
+        created without it, or already finalized, keeps its own settings and is left untouched.
+
+        Args:
+            collection_name (str): The name of the collection to finalize.
+
+        Returns:
+            bool: True if the collection was updated, False if it doesn't exist or wasn't created in bulk mode.
+        """
+        # The collection is looked up on the server rather than in the cache, which may be stale
+        try:
+            collection_config = self.client.get_collection(collection_name=collection_name).config
+        except (UnexpectedResponse, grpc.RpcError) as e:
+            if not self.is_not_found_error(e):
+                raise
+
+            self.forget_missing_collection(collection_name=collection_name, error=e)
+            return False
+
+        hnsw_config = models.HnswConfigDiff(m=self.default_hnsw_m) \
+            if collection_config.hnsw_config.m == 0 else None
+        optimizers_config = models.OptimizersConfigDiff(indexing_threshold=self.default_indexing_threshold) \
+            if collection_config.optimizer_config.indexing_threshold == 0 else None
+
+        if hnsw_config is None and optimizers_config is None:
+            return False
+
+        _ = self.client.update_collection(
+            collection_name=collection_name,
+            hnsw_config=hnsw_config,
+            optimizers_config=optimizers_config
+        )
+        return True
 
     # pylint: disable=too-many-arguments
-    def insert_one(self, collection_name: str, text: str, vector: list, metadata: dict = None, record_id: str = None):
+    def insert_one(self, collection_name: str, text: str, vector: Union[list, np.ndarray], metadata: dict = None,
+                   record_id: str = None):
         """
         Inserts a single record into the specified collection.
 
         Args:
             collection_name (str): The name of the collection to insert into.
             text (str): The text content to store.
-            vector (list): The vector representation of the text.
+            vector (list | np.ndarray): The vector representation of the text.
             metadata (dict, optional): Additional metadata to store with the record.
-            record_id (str, optional): A custom ID for the record.
+            record_id (str, optional): A custom ID for the record. Defaults to None (a random UUID).
 
         Returns:
             bool: True if the record was successfully inserted, False otherwise.
         """
         if not self.is_collection_existed(collection_name):
-            logger.error("Cannot insert new record into non-existing collection: %s", {collection_name})
+            logger.error("Cannot insert new record into non-existing collection: %s", collection_name)
             return False
 
         try:
@@ -138,80 +337,182 @@ class QdrantDBProvider(VectorDBInterface):
                 collection_name=collection_name,
                 records=[
                     models.Record(
-                        id=[record_id],
-                        vector=vector,
-                        payload={
-                            "text": text, "metadata": metadata
-                        }
+                        id=record_id if record_id is not None else str(uuid.uuid4()),
+                        vector=self.to_vector_list(vector),
+                        payload=self.build_payloads(texts=[text], metadata=[metadata])[0]
                     )
                 ]
             )
         except Exception as e:
             logger.error("Error while inserting record: %s", e)
+            self.forget_missing_collection(collection_name=collection_name, error=e)
             return False
 
         return True
 
     # pylint: disable=too-many-arguments
-    def insert_many(self, collection_name: str, texts: list, vectors: list, metadata: list = None,
-                    record_ids: list = None, batch_size: int = 50):
+    def insert_many(self, collection_name: str, texts: list, vectors: Union[list, np.ndarray], metadata: list = None,
+                    record_ids: list = None, batch_size: int = None):
         """
         Inserts multiple records into the specified collection in batches.
 
         Args:
             collection_name (str): The name of the collection to insert into.
             texts (list): A list of texts to store.
-            vectors (list): A list of vectors corresponding to the texts.
+            vectors (list | np.ndarray): The vectors corresponding to the texts, as a list or a (N, D) array.
             metadata (list, optional): A list of metadata corresponding to the texts.
-            record_ids (list, optional): A list of custom record IDs.
-            batch_size (int, optional): The size of each batch. Defaults to 50.
+            record_ids (list, optional): A list of custom record IDs. Defaults to None (random UUIDs).
+            batch_size (int, optional): The size of each batch. Defaults to None (`default_batch_size`).
 
         Returns:
             bool: True if all records were successfully inserted, False otherwise.
         """
-        if metadata is None:
-            metadata = [None] * len(texts)
-
+        # Random ids never collide with the points of the previous inserts, unlike positions would
         if record_ids is None:
-            record_ids = list(range(0, len(texts)))
-
-        for i in range(0, len(texts), batch_size):
-            batch_end = i + batch_size
-
-            batch_texts = texts[i:batch_end]
-            batch_vectors = vectors[i:batch_end]
-            batch_metadata = metadata[i:batch_end]
-            batch_record_ids = record_ids[i:batch_end]
-
-            batch_records = [
-                models.Record(
-                    id=batch_record_ids[x],
-                    vector=batch_vectors[x],
-                    payload={
-                        "text": batch_texts[x], "metadata": batch_metadata[x]
-                    }
-                )
-                for x in range(len(batch_texts))
-            ]
+            record_ids = [str(uuid.uuid4()) for _ in texts]
 
-            try:
-                _ = self.client.upload_records(
-                    collection_name=collection_name,
-                    records=batch_records,
-                )
-            except Exception as e:
-                logger.error("Error while inserting record: %s", e)
-                return False
+        # Larger batches amortize the per-request overhead over more records
+        batch_size = batch_size or self.default_batch_size
+
+        payloads = self.build_payloads(texts=texts, metadata=metadata)
+
+        def upload_batch(batch_start: int):
+            batch_end = batch_start + batch_size
+
+            # The columns are handed to the client as they are, without building a Record per point,
+            # and the client retries the batch if it fails
+            self.client.upload_collection(
+                collection_name=collection_name,
+                vectors=vectors[batch_start:batch_end],
+                payload=payloads[batch_start:batch_end],
+                ids=record_ids[batch_start:batch_end],
+                batch_size=batch_size,
+                max_retries=3
+            )
+
+        # The uploads are network-bound and the HTTP client releases the GIL while waiting, so the
+        # batches are uploaded from the pool of threads created on connect, without the worker
+        # processes of the client
+        try:
+            # An (N, D) float32 array is passed through as is, without copying it
+            vectors = np.asarray(vectors, dtype=np.float32)
+
+            futures = [
+                self.upload_executor.submit(upload_batch, batch_start)
+                for batch_start in range(0, len(texts), batch_size)
+            ]
+            for future in as_completed(futures):
+                future.result()
+        except Exception as e:
+            logger.error("Error while inserting record: %s", e)
+            self.forget_missing_collection(collection_name=collection_name, error=e)
+            return False
 
         return True
 
-    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5):
+    # pylint: disable=too-many-arguments
+    async def insert_many_async(self, collection_name: str, texts: list, vectors: Union[list, np.ndarray],
+                                metadata: list = None, record_ids: list = None, batch_size: int = None):
+        """
+        Asynchronously inserts multiple records into the specified collection in batches.
+
+        The batches are uploaded concurrently, at most `upload_concurrency` of them at once, so the
+        network round trips overlap instead of adding up.
+
+        Args:
+            collection_name (str): The name of the collection to insert into.
+            texts (list): A list of texts to store.
+            vectors (list | np.ndarray): The vectors corresponding to the texts, as a list or a (N, D) array.
+            metadata (list, optional): A list of metadata corresponding to the texts.
+            record_ids (list, optional): A list of custom record IDs. Defaults to None (random UUIDs).
+            batch_size (int, optional): The size of each batch. Defaults to None (`default_batch_size`).
+
+        Returns:
+            bool: True if all records were successfully inserted, False otherwise.
+        """
+        # Random ids never collide with the points of the previous inserts, unlike positions would
+        if record_ids is None:
+            record_ids = [str(uuid.uuid4()) for _ in texts]
+
+        # Larger batches amortize the per-request overhead over more records
+        batch_size = batch_size or self.default_batch_size
+
+        # The vectors are stacked once, so every batch is converted with a single tolist() call
+        try:
+            vectors = np.asarray(vectors, dtype=np.float32)
+        except Exception as e:
+            logger.error("Error while inserting record: %s", e)
+            self.forget_missing_collection(collection_name=collection_name, error=e)
+            return False
+
+        payloads = self.build_payloads(texts=texts, metadata=metadata)
+        semaphore = asyncio.Semaphore(self.upload_concurrency)
+
+        async def upload_batch(batch_start: int):
+            batch_end = batch_start + batch_size
+
+            batch = models.Batch(
+                ids=record_ids[batch_start:batch_end],
+                vectors=vectors[batch_start:batch_end].tolist(),
+                payloads=payloads[batch_start:batch_end]
+            )
+
+            async with semaphore:
+                try:
+                    _ = await self.async_client.upsert(collection_name=collection_name, points=batch)
+                except Exception as e:
+                    logger.error("Error while inserting record: %s", e)
+                    self.forget_missing_collection(collection_name=collection_name, error=e)
+                    return False
+
+            return True
+
+        results = await asyncio.gather(*[
+            upload_batch(batch_start) for batch_start in range(0, len(texts), batch_size)
+        ])
+
+        return all(results)
+
+    @staticmethod
+    def build_payloads(texts: list, metadata: list = None) -> list:
+        """
+        Builds the payloads of the records, in a single pass over the zipped texts and metadata.
+
+        Args:
+            texts (list): The texts of the records.
+            metadata (list, optional): The metadata of the records. Defaults to None (no metadata).
+
+        Returns:
+            list: The payload of each record, in the same order.
+        """
+        return [
+            {"text": text, "metadata": meta}
+            for text, meta in zip(texts, repeat(None) if metadata is None else metadata)
+        ]
+
+    @staticmethod
+    def to_vector_list(vector) -> list:
+        """
+        Converts a vector to the list of floats the Qdrant records are validated against.
+
+        The embeddings are kept as float32 ndarrays everywhere else, they are only converted here,
+        at the boundary with the database client.
+
+        Args:
+            vector (list | np.ndarray): The vector to convert.
+
+        Returns:
+            list: The vector as a list of floats.
+        """
+        return vector.tolist() if isinstance(vector, np.ndarray) else vector
+
+    def search_by_vector(self, collection_name: str, vector: Union[list, np.ndarray], limit: int = 5):
         """
         Searches for records in the specified collection that are similar to the provided vector.
 
         Args:
             collection_name (str): The name of the collection to search.
-            vector (list): The vector to search for similar records.
+            vector (list | np.ndarray): The vector to search for similar records.
             limit (int, optional): The number of similar records to return. Defaults to 5.
 
         Returns:
@@ -220,16 +521,60 @@ class QdrantDBProvider(VectorDBInterface):
         results = self.client.search(
             collection_name=collection_name,
             query_vector=vector,
-            limit=limit
+            limit=limit,
+            # Only the text of the hits is used, so neither their metadata nor their vectors are sent back
+            with_payload=["text"],
+            with_vectors=False,
+            # Re-score the quantized candidates with the original vectors to preserve recall
+            search_params=models.SearchParams(
+                quantization=models.QuantizationSearchParams(rescore=True)
+            )
         )
 
-        if not results or len(results) == 0:
-            return None
-
+        # The hits come from Qdrant with a float score and the text stored at insert time,
+        # so the documents are constructed without validation
         return [
-            RetrievedDocument(**{
-                "score": result.score,
-                "text": result.payload["text"]
-            })
+            RetrievedDocument.model_construct(score=result.score, text=result.payload["text"])
             for result in results
+        ] if results else []
+
+    def search_batch(self, collection_name: str, vectors: Union[List[list], np.ndarray], limit: int = 5):
+        """
+        Searches for records similar to each of the provided vectors, with a single request.
+
+        The queries are sent together to Qdrant's batch search endpoint, which saves a round trip
+        per query and lets the server process them in parallel.
+
+        Args:
+            collection_name (str): The name of the collection to search.
+            vectors (List[list] | np.ndarray): The vectors to search for similar records.
+            limit (int, optional): The number of similar records to return per vector. Defaults to 5.
+
+        Returns:
+            List: A list of search results per vector in the same order, each an empty list if no results
+                were found.
+        """
+        batch_results = self.client.search_batch(
+            collection_name=collection_name,
+            requests=[
+                models.SearchRequest(
+                    vector=self.to_vector_list(vector),
+                    limit=limit,
+                    with_payload=["text"],
+                    with_vector=False,
+                    # Re-score the quantized candidates with the original vectors to preserve recall
+                    params=models.SearchParams(
+                        quantization=models.QuantizationSearchParams(rescore=True)
+                    )
+                )
+                for vector in vectors
+            ]
+        )
+
+        return [
+            [
+                RetrievedDocument.model_construct(score=result.score, text=result.payload["text"])
+                for result in results
+            ]
+            for results in batch_results
         ]
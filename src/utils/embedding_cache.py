@@ -0,0 +1,98 @@
+import os
+import re
+import time
+import hashlib
+import tempfile
+import numpy as np
+
+
+class DiskEmbeddingCache:
+    """
+    A persistent cache of embeddings, stored as float32 `.npy` files on the local disk.
+
+    The embeddings of a text never change for a given model, so unlike the in-memory cache
+    this one survives the restarts of the application. Every embedding is stored in its own
+    file at `cache_dir/<model_id>/<sha256 of the text>.npy`, and the files are written to a
+    temporary name then renamed, so a reader never sees a partially written file.
+
+    Attributes:
+        cache_dir (str): The directory the embeddings are stored in.
+        ttl (float): The number of seconds an embedding stays valid, or None if embeddings never expire.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float = None):
+        """
+        Initializes the cache, creating its directory if it doesn't exist.
+
+        Args:
+            cache_dir (str): The directory the embeddings are stored in.
+            ttl (float, optional): The number of seconds an embedding stays valid. Defaults to None (no expiry).
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get_file_path(self, model_id: str, document_type: str, prompt: str) -> str:
+        """
+        Builds the path of the file storing the embedding of a text.
+
+        Args:
+            model_id (str): The ID of the model the embedding was computed with.
+            document_type (str): The type of the document (e.g., 'query', 'document').
+            prompt (str): The embedded text.
+
+        Returns:
+            str: The path of the embedding file.
+        """
+        # The model ID may contain path separators (e.g., "org/model")
+        model_dir = re.sub(r"[^\w.-]", "_", model_id)
+        digest = hashlib.sha256(f"{document_type}\0{prompt}".encode("utf-8")).hexdigest()
+
+        return os.path.join(self.cache_dir, model_dir, f"{digest}.npy")
+
+    def get(self, model_id: str, document_type: str, prompt: str):
+        """
+        Retrieves the embedding of a text from the disk.
+
+        Args:
+            model_id (str): The ID of the model the embedding was computed with.
+            document_type (str): The type of the document (e.g., 'query', 'document').
+            prompt (str): The embedded text.
+
+        Returns:
+            np.ndarray: The float32 embedding, or None if it is missing or expired.
+        """
+        file_path = self.get_file_path(model_id=model_id, document_type=document_type, prompt=prompt)
+
+        try:
+            if self.ttl is not None and os.path.getmtime(file_path) + self.ttl < time.time():
+                os.remove(file_path)
+                return None
+
+            return np.load(file_path)
+        except (OSError, ValueError):
+            # Missing, concurrently removed or unreadable files are all plain misses
+            return None
+
+    def set(self, model_id: str, document_type: str, prompt: str, embedding):
+        """
+        Stores the embedding of a text on the disk.
+
+        Args:
+            model_id (str): The ID of the model the embedding was computed with.
+            document_type (str): The type of the document (e.g., 'query', 'document').
+            prompt (str): The embedded text.
+            embedding (list | np.ndarray): The embedding to store.
+        """
+        file_path = self.get_file_path(model_id=model_id, document_type=document_type, prompt=prompt)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        file_descriptor, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as tmp_file:
+                np.save(tmp_file, np.asarray(embedding, dtype=np.float32))
+            os.replace(tmp_path, file_path)
+        except OSError:
+            # A failed write only costs a future miss
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
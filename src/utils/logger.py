@@ -1,17 +1,33 @@
+import os
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
 
 
 # Create a logger to log events and errors
 logger = logging.getLogger('my_logger')
-logger.setLevel(logging.DEBUG)  # Set the minimum log level to DEBUG for detailed logs
 
-# Create a file handler to write logs to a file
-file_handler = logging.FileHandler('uvicorn.log')
-file_handler.setLevel(logging.DEBUG)  # Set file log level to DEBUG
+# Set the minimum log level to INFO, or to DEBUG for detailed logs when the DEBUG environment variable
+# is set. The records below the level are dropped by the logger before any formatting work
+logger.setLevel(logging.DEBUG if os.environ.get("DEBUG") else logging.INFO)
+
+# Create a file handler to write logs to a file, rotated every 64MB and keeping the last 5 files.
+# Every worker process writes to its own file, so the workers never race on the same file's rollover
+file_handler = RotatingFileHandler(f'uvicorn-{os.getpid()}.log', maxBytes=64 * 1024 * 1024, backupCount=5)
 
 # Create a log format to structure the logs with timestamp, logger name, log level, and message
 formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 file_handler.setFormatter(formatter)
 
-# Add the file handler to the logger to enable logging to file
-logger.addHandler(file_handler)
+# The logger only puts the records on a queue, and a background thread formats and writes them
+# to the file, so logging never blocks the request handlers on disk I/O
+log_queue = SimpleQueue()
+log_listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+log_listener.start()
+
+# Flush the queued records to the file when the process exits
+atexit.register(log_listener.stop)
+
+# Add the queue handler to the logger to enable logging to file
+logger.addHandler(QueueHandler(log_queue))
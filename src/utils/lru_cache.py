@@ -0,0 +1,96 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class LRUCache:
+    """
+    A bounded, thread-safe least-recently-used cache with an optional time-to-live.
+
+    The lock is only held around the dictionary operations, never around the work
+    needed to produce a value, so a slow miss doesn't block the other callers.
+
+    Attributes:
+        max_size (int): The maximum number of entries kept in the cache.
+        ttl (float): The number of seconds an entry stays valid, or None if entries never expire.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = None):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_size (int): The maximum number of entries kept in the cache. Defaults to 1024.
+            ttl (float, optional): The number of seconds an entry stays valid. Defaults to None (no expiry).
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        """
+        Retrieves a value from the cache and marks it as the most recently used.
+
+        Args:
+            key (Hashable): The key of the entry to retrieve.
+            default (object, optional): The value returned on a miss. Defaults to None.
+
+        Returns:
+            object: The cached value, or `default` if the key is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """
+        Stores a value in the cache, evicting the least recently used entries when full.
+
+        Args:
+            key (Hashable): The key of the entry to store.
+            value (object): The value to store.
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """
+        Removes an entry from the cache.
+
+        Args:
+            key (Hashable): The key of the entry to remove.
+            default (object, optional): The value returned if the key is missing. Defaults to None.
+
+        Returns:
+            object: The removed value, or `default` if the key was missing.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        """
+        Removes all the entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
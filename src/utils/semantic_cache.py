@@ -0,0 +1,137 @@
+import time
+from threading import Lock
+import numpy as np
+
+
+class SemanticCache:
+    """
+    A bounded, thread-safe cache of values keyed by embeddings, matched by cosine similarity.
+
+    Unlike an exact-match cache, a lookup hits when a cached embedding is close enough to the
+    looked up one, so rephrasings of an already answered question reuse its answer. The entries
+    are grouped in namespaces (e.g., one per project), each holding its normalized embeddings
+    in a single (K, D) float32 matrix, so a lookup is one matrix-vector product.
+
+    The cache lives in the memory of a single process, and so does `invalidate`: with several
+    workers, the others keep serving their entries until these expire, after `ttl` seconds.
+
+    Attributes:
+        max_size (int): The maximum number of entries kept per namespace.
+        threshold (float): The minimum cosine similarity for a lookup to hit.
+        ttl (float): The number of seconds an entry stays valid, or None if entries never expire.
+    """
+
+    def __init__(self, max_size: int = 1000, threshold: float = 0.97, ttl: float = 600):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_size (int): The maximum number of entries kept per namespace. Defaults to 1000.
+            threshold (float): The minimum cosine similarity for a lookup to hit. Defaults to 0.97.
+            ttl (float, optional): The number of seconds an entry stays valid. Defaults to 600,
+                                   None means entries never expire.
+        """
+        self.max_size = max_size
+        self.threshold = threshold
+        self.ttl = ttl
+        self._namespaces = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def normalize(embedding) -> np.ndarray:
+        """
+        Converts an embedding to a unit-length float32 vector, so dot products are cosine similarities.
+
+        Args:
+            embedding (list | np.ndarray): The embedding to normalize.
+
+        Returns:
+            np.ndarray: The normalized embedding, or None if its norm is zero.
+        """
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+
+        return vector / norm if norm else None
+
+    def get(self, namespace, embedding, tag=None, default=None):
+        """
+        Retrieves the value of the cached embedding most similar to the given one.
+
+        Args:
+            namespace (Hashable): The namespace to look into.
+            embedding (list | np.ndarray): The embedding to look up.
+            tag (Hashable, optional): Only the entries stored with this tag can match. Defaults to None.
+            default (object, optional): The value returned on a miss. Defaults to None.
+
+        Returns:
+            object: The value of the most similar entry, or `default` if none reaches the threshold.
+        """
+        vector = self.normalize(embedding)
+        if vector is None:
+            return default
+
+        with self._lock:
+            entries = self._namespaces.get(namespace)
+            if entries is None:
+                return default
+            bank, tags, expirations, values = entries
+
+        if bank.shape[1] != vector.shape[0]:
+            return default
+
+        scores = bank @ vector
+        if tag is not None:
+            scores = np.where(tags == tag, scores, -np.inf)
+
+        # The expired entries never match, they are dropped as the newer ones push them out
+        scores = np.where(expirations >= time.monotonic(), scores, -np.inf)
+
+        best_idx = int(np.argmax(scores))
+        if scores[best_idx] < self.threshold:
+            return default
+
+        return values[best_idx]
+
+    def set(self, namespace, embedding, value, tag=None):
+        """
+        Stores a value under an embedding, evicting the oldest entries of the namespace when full.
+
+        Args:
+            namespace (Hashable): The namespace to store into.
+            embedding (list | np.ndarray): The embedding to store the value under.
+            value (object): The value to store.
+            tag (Hashable, optional): The tag the entry is stored with. Defaults to None.
+        """
+        vector = self.normalize(embedding)
+        if vector is None:
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else np.inf
+
+        with self._lock:
+            entries = self._namespaces.get(namespace)
+            if entries is None or entries[0].shape[1] != vector.shape[0]:
+                bank, tags, expirations, values = np.empty((0, vector.shape[0]), dtype=np.float32), \
+                    np.empty(0, dtype=object), np.empty(0, dtype=np.float64), []
+            else:
+                bank, tags, expirations, values = entries
+
+            # The arrays are never modified in place, so the lookups that already read them stay consistent
+            bank = np.vstack([bank, vector])[-self.max_size:]
+            tags = np.append(tags, np.array([tag], dtype=object))[-self.max_size:]
+            expirations = np.append(expirations, expires_at)[-self.max_size:]
+            values = (values + [value])[-self.max_size:]
+
+            self._namespaces[namespace] = (bank, tags, expirations, values)
+
+    def invalidate(self, namespace):
+        """
+        Removes all the entries of a namespace, e.g. once the documents its values were built from change.
+
+        Only the entries of the current process are removed, the other workers' expire with their TTL.
+
+        Args:
+            namespace (Hashable): The namespace to clear.
+        """
+        with self._lock:
+            self._namespaces.pop(namespace, None)